@@ -8,12 +8,120 @@ Algorithmes pour la planification dans le risque
 @author: Clémence BOURGUE
 @author: Ariana CARNIELLI
 """
+import hashlib
+import inspect
+import json
+import numbers
+import os
+import pickle
 import random
 import time
 import numpy as np
-import gurobipy as gp
-import tkinter as tk
-from collections import defaultdict
+import scipy.sparse as sp
+import heapq
+from collections import OrderedDict, defaultdict
+from functools import lru_cache
+# Les modules lourds ou optionnels (gurobipy, tkinter, scipy.optimize, 
+# scipy.sparse.linalg, multiprocessing) ne sont importés qu'au premier appel
+# des fonctions qui en ont besoin, pour que l'import de ce module reste rapide.
+
+@lru_cache(maxsize = None)
+def _gurobipy():
+    """
+    Retourne le module gurobipy, importé au premier appel, ou None s'il n'est
+    pas installé.
+    """
+    try:
+        import gurobipy
+    except ImportError:
+        return None
+    return gurobipy
+
+# Déplacements (di, dj) associés à chaque action : 0-haut, 1-droite, 2-bas, 
+# 3-gauche
+DEPLACEMENTS = ((-1, 0), (0, 1), (1, 0), (0, -1))
+
+class Profilage():
+    """
+    Contexte de profilage : dans un bloc 
+        with Profilage() as prof:
+            ...
+    les statistiques de chaque appel de pol_valeur, pol_valeur_lot,
+    pol_valeur_mo, pol_iteration, pol_iteration_modifiee, evaluer_politique,
+    SolveurIncremental.resoudre, pol_pl_*, SolveurPL.resoudre, front_pareto,
+    simulation_lot et simulation_parallele sont gardées dans prof.appels,
+    même sans stats = True ou temps = True. Les contextes peuvent être
+    imbriqués.
+        
+    Attributes
+    ----------
+    appels : list(dict)
+        Les statistiques de chaque appel, avec le nom de la fonction 
+        ('fonction').
+    """
+    
+    def __init__(self):
+        self.appels = []
+        
+    def __enter__(self):
+        _PROFILAGES.append(self)
+        return self
+    
+    def __exit__(self, *exc):
+        _PROFILAGES.remove(self)
+        return False
+    
+    def resume(self):
+        """
+        Regroupe les appels par fonction.
+
+        Returns
+        -------
+        dict
+            Dictionnaire indexé par le nom des fonctions, contenant le nombre
+            d'appels ('nb_appels') et la somme de chaque statistique 
+            numérique sur tous les appels.
+        """
+        resume = {}
+        for appel in self.appels:
+            total = resume.setdefault(appel["fonction"], {"nb_appels": 0})
+            total["nb_appels"] += 1
+            for cle, valeur in appel.items():
+                if isinstance(valeur, (int, float, np.integer, np.floating)) and not isinstance(valeur, bool):
+                    total[cle] = total.get(cle, 0) + valeur
+        return resume
+
+_PROFILAGES = []
+
+def _enregistrer(fonction, infos):
+    """
+    Ajoute les statistiques d'un appel de fonction aux Profilage actifs.
+    """
+    for profilage in _PROFILAGES:
+        profilage.appels.append(dict(infos, fonction = fonction))
+
+def _suivi(infos, rappel, debut):
+    """
+    Retourne la fonction appelée par les solveurs après chaque itération :
+    elle garde le dernier résidu dans infos et appelle
+    rappel(iteration, residu, temps) si rappel est donné.
+    """
+    def suivre(iteration, residu):
+        infos["residu"] = float(residu)
+        if rappel is not None:
+            rappel(iteration, residu, time.perf_counter() - debut)
+    return suivre
+
+def _statut(valeurs, residu = None):
+    """
+    Statut d'un solveur d'après ses valeurs et son dernier résidu. Les 
+    boucles s'arrêtent quand leur critère est atteint, mais aussi quand les
+    valeurs ou le résidu ne sont plus finis (un résidu NaN n'est pas 
+    supérieur à eps, par exemple avec gamma > 1) : le statut est alors 
+    'non_fini' au lieu de 'converge'.
+    """
+    finis = np.isfinite(valeurs).all() and (residu is None or np.isfinite(residu))
+    return "converge" if finis else "non_fini"
 
 class Grille():
     """
@@ -76,6 +184,305 @@ class Grille():
         self.chiffre = np.random.choice(9, self.tab.shape, p = proba_nb) + 1
         self.tab_cost = tab_cost
         self.p = p
+        self._reinit_cache()
+        
+    @classmethod
+    def lot(cls, n, nb_lig, nb_col, tab_cost = [1, 2, 3, 4], p = 1, proba_coul = None, proba_mur = 0, proba_nb = None, 
+            seed = None, possibles = True, max_tirages = 1000):
+        """
+        Crée n grilles de même taille, avec les mêmes lois que le 
+        constructeur. Toutes les couleurs et tous les poids sont tirés en une
+        seule fois sous la forme de tableaux de taille (n, nb_lig, nb_col). Si
+        possibles est True, on ne garde que des grilles où la case but est 
+        atteignable depuis la case initiale (comme est_possible) : le test est
+        fait sur tout le lot en même temps par un étiquetage des composantes 
+        connexes, et seules les grilles qui ne conviennent pas sont retirées.
+
+        Parameters
+        ----------
+        n : int
+            Nombre de grilles.
+        nb_lig, nb_col, tab_cost, p, proba_coul, proba_mur, proba_nb :
+            Voir le constructeur.
+        seed : None, int ou numpy.random.Generator
+            Graine ou générateur aléatoire utilisé. Le défaut est None.
+        possibles : bool
+            Si True, toutes les grilles retournées sont possibles. Le défaut
+            est True.
+        max_tirages : int
+            Nombre maximal de tirages des grilles qui ne sont pas possibles.
+            Le défaut est 1000.
+
+        Returns
+        -------
+        list(Grille)
+            Les n grilles.
+        """
+        couleurs = len(tab_cost)
+        assert (proba_coul is None) or (len(proba_coul) == couleurs), "Tableau des probabilités des couleurs avec la mauvaise taille"   
+        rng = np.random.default_rng(seed)
+        proba_tab = np.empty(couleurs + 1)
+        proba_tab[0] = proba_mur
+        proba_tab[1:] = (np.ones(couleurs) / couleurs) if proba_coul is None else proba_coul
+        proba_tab[1:] *= (1 - proba_mur)
+        
+        tabs = rng.choice(couleurs + 1, (n, nb_lig, nb_col), p = proba_tab) - 1
+        chiffres = rng.choice(9, tabs.shape, p = proba_nb) + 1
+        if possibles:
+            a_refaire = np.flatnonzero(~_sont_possibles(tabs))
+            tirages = 1
+            while a_refaire.size > 0:
+                if tirages == max_tirages:
+                    raise ValueError("Pas de grille possible après {} tirages".format(max_tirages))
+                tabs[a_refaire] = rng.choice(couleurs + 1, (a_refaire.size, nb_lig, nb_col), p = proba_tab) - 1
+                a_refaire = a_refaire[~_sont_possibles(tabs[a_refaire])]
+                tirages += 1
+        
+        grilles = []
+        for tab, chiffre in zip(tabs, chiffres):
+            grille = cls.__new__(cls)
+            grille.tab = tab
+            grille.chiffre = chiffre
+            grille.tab_cost = tab_cost
+            grille.p = p
+            grille._reinit_cache()
+            grilles.append(grille)
+        return grilles
+        
+    def _reinit_cache(self):
+        """
+        Vide le cache de la matrice de transitions et des vecteurs de coûts.
+        """
+        self._trans = None
+        self._trans_cle = None
+        self._tables = None
+        self._acces = None
+        self._couts = {}
+        self._couts_cle = None
+        
+    def matrice_trans(self):
+        """
+        Retourne la matrice creuse des transitions de la grille. Elle est
+        calculée une seule fois et gardée en cache tant que tab et p ne
+        changent pas (les modifications en place de tab sont aussi détectées).
+        Les cases sont numérotées ligne par ligne (s = i * nb_col + j) et la
+        ligne s * 4 + a de la matrice contient les probabilités T(s, a, s’) 
+        d’atteindre chaque case s’ en prenant l’action a depuis la case s.
+        
+        Returns
+        -------
+        scipy.sparse.csr_matrix
+            Matrice de taille (nb_cases * 4, nb_cases).
+        """
+        if (self._trans is None or self._trans_cle[1] != self.p 
+            or not np.array_equal(self._trans_cle[0], self.tab)):
+            self._trans = self._construire_trans()
+            self._trans_cle = (self.tab.copy(), self.p)
+            self._tables = None
+            self._acces = None
+        return self._trans
+    
+    def tables_cumulees(self):
+        """
+        Retourne les tables des transitions utilisées pour tirer les cases 
+        d’arrivée par inversion de la fonction de répartition. Elles sont 
+        calculées à partir de matrice_trans et gardées en cache avec elle.
+
+        Returns
+        -------
+        cases : numpy.ndarray
+            Tableau de taille (nb_cases * 4, K) où la ligne s * 4 + a contient
+            les cases atteignables depuis s avec l’action a (K est le nombre 
+            maximal de cases atteignables, complété en répétant la dernière).
+        cumul : numpy.ndarray
+            Tableau de même taille avec les probabilités cumulées 
+            correspondantes. La dernière colonne vaut exactement 1.
+        """
+        trans = self.matrice_trans()
+        if self._tables is None:
+            nb_par_ligne = np.diff(trans.indptr)
+            K = nb_par_ligne.max()
+            # Position de chaque élément non nul dans sa ligne
+            lignes = np.repeat(np.arange(trans.shape[0]), nb_par_ligne)
+            pos = np.arange(trans.nnz) - trans.indptr[lignes]
+            cases = np.empty((trans.shape[0], K), dtype = int)
+            probas = np.zeros((trans.shape[0], K))
+            cases[lignes, pos] = trans.indices
+            probas[lignes, pos] = trans.data
+            # On complète chaque ligne avec sa dernière case, de sorte qu'un
+            # tirage au-delà du dernier cumul (erreurs d'arrondi) y tombe aussi
+            for k in range(1, K):
+                court = nb_par_ligne <= k
+                cases[court, k] = cases[court, k - 1]
+            cumul = probas.cumsum(1)
+            cumul[:, -1] = 1
+            self._tables = (cases, cumul)
+        return self._tables
+    
+    def _construire_trans(self, etats = None):
+        """
+        Construit la matrice de transitions de façon vectorisée, en suivant
+        les mêmes règles que proba_trans. Si etats (tableau de numéros de 
+        cases) est donné, ne construit que les lignes de ces cases : la ligne
+        k * 4 + a du résultat correspond à la case etats[k] et à l'action a.
+        """
+        return _transitions(self.tab[None], np.array([self.p], dtype = float), etats)
+    
+    def modifier(self, cases, couleurs = None, chiffres = None):
+        """
+        Modifie quelques cases de la grille. Si la matrice de transitions et
+        les vecteurs de coûts sont en cache, seules les lignes des cases dont
+        les transitions ou le coût changent sont recalculées (une case ne 
+        change les transitions que des cases de son voisinage 3x3), au lieu
+        de tout reconstruire au prochain appel.
+
+        Parameters
+        ----------
+        cases : list((int, int))
+            Les cases (i, j) à modifier.
+        couleurs : list(int)
+            Les nouvelles couleurs des cases (-1 pour un mur). Si None, les
+            couleurs ne changent pas. Le défaut est None.
+        chiffres : list(int)
+            Les nouveaux poids des cases. Si None, les poids ne changent pas.
+            Le défaut est None.
+
+        Returns
+        -------
+        numpy.ndarray
+            Les numéros (s = i * nb_col + j) des cases dont les transitions ou
+            le coût ont changé, triés.
+        """
+        lig, col = self.tab.shape
+        cases = np.asarray(cases, dtype = int).reshape(-1, 2)
+        ii, jj = cases[:, 0], cases[:, 1]
+        # On vérifie le cache avant la modification, pour ne pas patcher un
+        # cache déjà périmé
+        trans_ok = (self._trans is not None and self._trans_cle[1] == self.p
+                    and np.array_equal(self._trans_cle[0], self.tab))
+        couts_ok = (self._couts_cle is not None and self._couts_cle[2] == tuple(self.tab_cost)
+                    and np.array_equal(self._couts_cle[0], self.tab)
+                    and np.array_equal(self._couts_cle[1], self.chiffre))
+        
+        anciens_murs = self.tab[ii, jj] < 0
+        modifiees = np.zeros(len(cases), dtype = bool)
+        if couleurs is not None:
+            couleurs = np.asarray(couleurs, dtype = int)
+            modifiees |= self.tab[ii, jj] != couleurs
+            self.tab[ii, jj] = couleurs
+        if chiffres is not None:
+            chiffres = np.asarray(chiffres, dtype = int)
+            modifiees |= self.chiffre[ii, jj] != chiffres
+            self.chiffre[ii, jj] = chiffres
+        
+        # Cases dont les transitions changent : voisinage 3x3 des cases qui 
+        # deviennent ou cessent d'être des murs
+        murs = anciens_murs != (self.tab[ii, jj] < 0)
+        voisins = [np.ravel_multi_index((i + di, j + dj), (lig, col)) 
+                   for i, j in cases[murs] for di in (-1, 0, 1) for dj in (-1, 0, 1)
+                   if 0 <= i + di < lig and 0 <= j + dj < col]
+        etats_trans = np.unique(np.array(voisins, dtype = int))
+        etats_cout = np.unique(np.ravel_multi_index((ii[modifiees], jj[modifiees]), (lig, col)))
+        
+        if trans_ok:
+            if etats_trans.size > 0:
+                self._trans = _remplacer_lignes(self._trans, (etats_trans[:, None] * 4 + np.arange(4)).ravel(),
+                                                self._construire_trans(etats_trans))
+                self._tables = None
+                self._acces = None
+            self._trans_cle[0][ii, jj] = self.tab[ii, jj]
+        if couts_ok:
+            tab = self.tab.ravel()[etats_cout]
+            mur = tab < 0
+            chiffre = self.chiffre.ravel()[etats_cout]
+            for mode, cout in self._couts.items():
+                if mode == "couleur":
+                    cout[etats_cout] = np.where(mur, 0., np.asarray(self.tab_cost, dtype = float)[tab])
+                elif mode == "somme_chiffre":
+                    cout[etats_cout] = np.where(mur, 0., chiffre)
+                else:
+                    cout[etats_cout] = 0
+                    cout[etats_cout[~mur], tab[~mur]] = chiffre[~mur]
+            self._couts_cle[0][ii, jj] = self.tab[ii, jj]
+            self._couts_cle[1][ii, jj] = self.chiffre[ii, jj]
+        return np.union1d(etats_trans, etats_cout)
+    
+    def accessibilite(self):
+        """
+        Calcule les cases atteignables depuis la case initiale (0, 0) et les 
+        cases depuis lesquelles la case but est atteignable, par des parcours 
+        en largeur (scipy.sparse.csgraph) sur le graphe des transitions de 
+        matrice_trans et sur le graphe inversé. Le résultat est gardé en cache
+        avec matrice_trans.
+
+        Returns
+        -------
+        depuis_depart : numpy.ndarray
+            Tableau 2D de booléens, True pour les cases atteignables depuis la
+            case initiale.
+        vers_but : numpy.ndarray
+            Tableau 2D de booléens, True pour les cases depuis lesquelles la 
+            case but est atteignable.
+        """
+        trans = self.matrice_trans()
+        if self._acces is None:
+            from scipy.sparse.csgraph import breadth_first_order
+            nb = self.tab.size
+            libres = self.tab.ravel() >= 0
+            # Graphe des cases : arc s -> s’ si T(s, a, s’) > 0 pour une action
+            # a, depuis une case s qui n'est pas un mur
+            etats = np.repeat(np.arange(trans.shape[0]) // 4, np.diff(trans.indptr))
+            arcs = libres[etats]
+            graphe = sp.csr_matrix((np.ones(arcs.sum()), (etats[arcs], trans.indices[arcs])), shape = (nb, nb))
+            acces = []
+            for g, depart in ((graphe, 0), (graphe.T.tocsr(), nb - 1)):
+                masque = np.zeros(nb, dtype = bool)
+                if libres[depart]:
+                    masque[breadth_first_order(g, depart, return_predecessors = False)] = True
+                acces.append(masque.reshape(self.tab.shape))
+            self._acces = tuple(acces)
+        return self._acces
+    
+    def vecteur_cout(self, mode):
+        """
+        Retourne les coûts de toutes les cases de la grille d’après le mode de
+        calcul, dans la même numérotation que matrice_trans. Le résultat est
+        gardé en cache tant que tab, chiffre et tab_cost ne changent pas. Les
+        murs ont un coût nul.
+
+        Parameters
+        ----------
+        mode : String
+            Le mode de calcul du coût. 'couleur', 'somme_chiffre' ou 'chiffre'.
+
+        Returns
+        -------
+        numpy.ndarray
+            Tableau de taille nb_cases dans les modes 'couleur' et 
+            'somme_chiffre'. Dans le mode 'chiffre', tableau de taille
+            (nb_cases, nb_couleurs) où chaque ligne contient le poids de la 
+            case dans la colonne de sa couleur.
+        """
+        if (self._couts_cle is None or self._couts_cle[2] != tuple(self.tab_cost)
+            or not np.array_equal(self._couts_cle[0], self.tab)
+            or not np.array_equal(self._couts_cle[1], self.chiffre)):
+            self._couts = {}
+            self._couts_cle = (self.tab.copy(), self.chiffre.copy(), tuple(self.tab_cost))
+        if mode not in self._couts:
+            tab = self.tab.ravel()
+            mur = tab < 0
+            if mode == "couleur":
+                cout = np.asarray(self.tab_cost, dtype = float)[tab]
+                cout[mur] = 0
+            elif mode == "somme_chiffre":
+                cout = np.where(mur, 0., self.chiffre.ravel())
+            elif mode == "chiffre":
+                cout = np.zeros((tab.size, len(self.tab_cost)))
+                cout[~mur, tab[~mur]] = self.chiffre.ravel()[~mur]
+            else:
+                raise ValueError("Mode inconnu : " + str(mode))
+            self._couts[mode] = cout
+        return self._couts[mode]
       
     def proba_trans(self, i, j, action):
         """
@@ -292,7 +699,373 @@ class Grille():
                 if self.case_possible(k, l) and (k, l) not in visites:
                     pile.append((k, l))
         return False
+    
+    def sauvegarder(self, chemin, trans = False):
+        """
+        Sauvegarde la grille dans le dossier chemin (créé s'il n'existe pas) :
+        un fichier .npy par tableau (tab, chiffre et, si trans est True, les 
+        tableaux CSR de matrice_trans) et un fichier meta.json avec la 
+        version du format, tab_cost et p. Les fichiers .npy peuvent être 
+        relus avec mmap_mode (voir charger).
+
+        Parameters
+        ----------
+        chemin : String
+            Le dossier où sauvegarder la grille.
+        trans : bool
+            Si True, sauvegarde aussi la matrice de transitions. Le défaut est
+            False.
+        """
+        meta = {"format": "grille", "version": VERSION_FORMAT, 
+                "tab_cost": np.asarray(self.tab_cost).tolist(), "p": float(self.p), "trans": trans}
+        tableaux = {"tab": self.tab, "chiffre": self.chiffre}
+        if trans:
+            matrice = self.matrice_trans()
+            tableaux.update(trans_data = matrice.data, trans_indices = matrice.indices, 
+                            trans_indptr = matrice.indptr)
+        _sauvegarder_dossier(chemin, meta, tableaux)
+        
+    @classmethod
+    def charger(cls, chemin, mmap_mode = None):
+        """
+        Charge une grille sauvegardée avec sauvegarder. Avec mmap_mode = 'r',
+        les tableaux sont projetés en mémoire sans être copiés, et peuvent 
+        donc être partagés par plusieurs processus ; ils sont alors en lecture
+        seule.
+
+        Parameters
+        ----------
+        chemin : String
+            Le dossier de la grille.
+        mmap_mode : None ou String
+            Passé à numpy.load. Le défaut est None (lecture en mémoire).
+
+        Returns
+        -------
+        Grille
+            La grille chargée, avec sa matrice de transitions si elle a été 
+            sauvegardée.
+        """
+        meta, tableaux = _charger_dossier(chemin, "grille", mmap_mode)
+        grille = cls.__new__(cls)
+        grille.tab = tableaux["tab"]
+        grille.chiffre = tableaux["chiffre"]
+        grille.tab_cost = meta["tab_cost"]
+        grille.p = meta["p"]
+        grille._reinit_cache()
+        if meta["trans"]:
+            nb = grille.tab.size
+            grille._trans = sp.csr_matrix((tableaux["trans_data"], tableaux["trans_indices"], 
+                                           tableaux["trans_indptr"]), shape = (nb * 4, nb), copy = False)
+            grille._trans_cle = (np.array(grille.tab), grille.p)
+        return grille
+         
+# Version du format des dossiers écrits par Grille.sauvegarder et 
+# sauvegarder_resultat
+VERSION_FORMAT = 1
+
+def _sauvegarder_dossier(chemin, meta, tableaux):
+    """
+    Écrit les tableaux dans des fichiers .npy du dossier chemin et meta dans 
+    meta.json (avec la liste des tableaux).
+    """
+    os.makedirs(chemin, exist_ok = True)
+    meta = dict(meta, tableaux = sorted(tableaux))
+    for nom, tableau in tableaux.items():
+        np.save(os.path.join(chemin, nom + ".npy"), np.asarray(tableau))
+    with open(os.path.join(chemin, "meta.json"), "w") as fichier:
+        json.dump(meta, fichier, indent = 1)
+
+def _charger_dossier(chemin, format_attendu, mmap_mode):
+    """
+    Relit un dossier écrit par _sauvegarder_dossier, en vérifiant son format
+    et sa version.
+
+    Returns
+    -------
+    meta : dict
+        Le contenu de meta.json.
+    tableaux : dict(String, numpy.ndarray)
+        Les tableaux, éventuellement projetés en mémoire.
+    """
+    with open(os.path.join(chemin, "meta.json")) as fichier:
+        meta = json.load(fichier)
+    if meta.get("format") != format_attendu:
+        raise ValueError("Le dossier {} ne contient pas un objet de type '{}'".format(chemin, format_attendu))
+    if meta["version"] > VERSION_FORMAT:
+        raise ValueError("Version du format {} non supportée (au plus {})".format(meta["version"], VERSION_FORMAT))
+    tableaux = {nom: np.load(os.path.join(chemin, nom + ".npy"), mmap_mode = mmap_mode) 
+                for nom in meta["tableaux"]}
+    return meta, tableaux
+
+def sauvegarder_resultat(chemin, strategy = None, valeurs = None, **infos):
+    """
+    Sauvegarde le résultat d'un solveur dans le dossier chemin, dans le même
+    format que Grille.sauvegarder. On peut par exemple le mettre dans un 
+    sous-dossier du dossier de la grille.
+
+    Parameters
+    ----------
+    chemin : String
+        Le dossier où sauvegarder le résultat.
+    strategy : numpy.ndarray
+        Une stratégie pure (2D) ou mixte (3D). Le défaut est None.
+    valeurs : numpy.ndarray
+        Les valeurs des cases. Le défaut est None.
+    **infos :
+        Informations sur le calcul (solveur, gamma, M, mode, ...), qui doivent
+        pouvoir être écrites en JSON.
+    """
+    tableaux = {}
+    if strategy is not None:
+        tableaux["strategy"] = strategy
+    if valeurs is not None:
+        tableaux["valeurs"] = valeurs
+    _sauvegarder_dossier(chemin, {"format": "resultat", "version": VERSION_FORMAT, "infos": infos}, tableaux)
+
+def charger_resultat(chemin, mmap_mode = None):
+    """
+    Charge un résultat sauvegardé avec sauvegarder_resultat.
+
+    Parameters
+    ----------
+    chemin : String
+        Le dossier du résultat.
+    mmap_mode : None ou String
+        Passé à numpy.load. Le défaut est None.
+
+    Returns
+    -------
+    dict
+        Dictionnaire avec les clés 'strategy' et 'valeurs' (None si absentes)
+        et 'infos'.
+    """
+    meta, tableaux = _charger_dossier(chemin, "resultat", mmap_mode)
+    return {"strategy": tableaux.get("strategy"), "valeurs": tableaux.get("valeurs"), "infos": meta["infos"]}
          
+def _transitions(tabs, ps, etats = None):
+    """
+    Construit la matrice de transitions d'un lot de grilles de même taille, 
+    de façon vectorisée (voir Grille.matrice_trans). Les cases de la grille
+    n sont numérotées à partir de n * nb_cases, de sorte que la matrice est
+    diagonale par blocs.
+
+    Parameters
+    ----------
+    tabs : numpy.ndarray
+        Tableau de taille (nb_grilles, nb_lig, nb_col) des couleurs (-1 pour
+        les murs).
+    ps : numpy.ndarray
+        Valeur de p de chaque grille.
+    etats : numpy.ndarray
+        Si donné, seules les lignes de ces cases sont construites : la ligne
+        k * 4 + a du résultat correspond à la case etats[k] et à l'action a.
+        Le défaut est None.
+
+    Returns
+    -------
+    scipy.sparse.csr_matrix
+        Matrice de taille (nb_etats * 4, nb_grilles * nb_cases).
+    """
+    nb_grilles, lig, col = tabs.shape
+    nb = lig * col
+    # Cases atteignables, entourées d'une bordure de murs
+    possible = np.zeros((nb_grilles, lig + 2, col + 2), dtype = bool)
+    possible[:, 1:-1, 1:-1] = tabs >= 0
+    if etats is None:
+        etats = np.arange(nb_grilles * nb)
+    nn, reste = np.divmod(etats, nb)
+    ii, jj = np.divmod(reste, col)
+    p = ps[nn]
+    lignes, colonnes, probas = [], [], []
+    for a, (di, dj) in enumerate(DEPLACEMENTS):
+        ligne = np.arange(etats.size) * 4 + a
+        ci, cj = ii + di, jj + dj
+        cible_ok = possible[nn, ci + 1, cj + 1]
+        cible = np.where(cible_ok, nn * nb + ci * col + cj, etats)
+        # Case visée (ou on reste sur place si elle n'est pas atteignable)
+        lignes.append(ligne)
+        colonnes.append(cible)
+        probas.append(np.where(cible_ok, p, 1.))
+        # Cases voisines de la case visée, perpendiculaires à l'action. 
+        # Si une voisine n'est pas atteignable, sa probabilité revient à
+        # la case visée.
+        for signe in (-1, 1):
+            vi, vj = ci + signe * abs(dj), cj + signe * abs(di)
+            voisin_ok = possible[nn, vi + 1, vj + 1]
+            voisin = np.where(voisin_ok, nn * nb + vi * col + vj, cible)
+            lignes.append(ligne[cible_ok])
+            colonnes.append(voisin[cible_ok])
+            probas.append((1 - p[cible_ok]) / 2)
+    trans = sp.coo_matrix((np.concatenate(probas), 
+                           (np.concatenate(lignes), np.concatenate(colonnes))), 
+                          shape = (etats.size * 4, nb_grilles * nb)).tocsr()
+    trans.eliminate_zeros()
+    return trans
+
+def _remplacer_lignes(mat, lignes, nouvelles):
+    """
+    Retourne une copie de la matrice CSR mat où les lignes d'indices lignes
+    (triés) sont remplacées par les lignes de la matrice CSR nouvelles, sans
+    repasser par le format COO.
+    """
+    nb_lignes = mat.shape[0]
+    taille = np.diff(mat.indptr)
+    gardees = np.ones(nb_lignes, dtype = bool)
+    gardees[lignes] = False
+    taille_new = taille.copy()
+    taille_new[lignes] = np.diff(nouvelles.indptr)
+    indptr = np.zeros(nb_lignes + 1, dtype = mat.indptr.dtype)
+    np.cumsum(taille_new, out = indptr[1:])
+    
+    # Position de chaque élément gardé dans la nouvelle matrice
+    ligne_elem = np.repeat(np.arange(nb_lignes), taille)
+    elem_gardes = gardees[ligne_elem]
+    ligne_elem = ligne_elem[elem_gardes]
+    pos = np.arange(mat.nnz)[elem_gardes] - mat.indptr[ligne_elem] + indptr[ligne_elem]
+    # Position des éléments des nouvelles lignes
+    ligne_new = np.repeat(lignes, np.diff(nouvelles.indptr))
+    pos_new = np.arange(nouvelles.nnz) - nouvelles.indptr[:-1].repeat(np.diff(nouvelles.indptr)) + indptr[ligne_new]
+    
+    indices = np.empty(indptr[-1], dtype = mat.indices.dtype)
+    data = np.empty(indptr[-1], dtype = mat.data.dtype)
+    indices[pos] = mat.indices[elem_gardes]
+    data[pos] = mat.data[elem_gardes]
+    indices[pos_new] = nouvelles.indices
+    data[pos_new] = nouvelles.data
+    return sp.csr_matrix((data, indices, indptr), shape = mat.shape)
+
+def _sont_possibles(tabs):
+    """
+    Version vectorisée de Grille.est_possible pour un tableau de grilles de 
+    taille (n, nb_lig, nb_col) : étiquetage des composantes 4-connexes des 
+    cases libres de chaque grille (scipy.ndimage.label), puis comparaison des
+    étiquettes de la case initiale et de la case but.
+
+    Returns
+    -------
+    numpy.ndarray
+        Tableau de n booléens, True si la case but de la grille est 
+        atteignable depuis la case initiale.
+    """
+    from scipy import ndimage
+    # Voisinage en croix dans chaque grille, sans lien entre les grilles
+    structure = np.zeros((3, 3, 3), dtype = bool)
+    structure[1] = [[0, 1, 0], [1, 1, 1], [0, 1, 0]]
+    etiquettes, _ = ndimage.label(tabs >= 0, structure)
+    return (etiquettes[:, 0, 0] > 0) & (etiquettes[:, 0, 0] == etiquettes[:, -1, -1])
+
+# Chiffres 1 à 9 en police bitmap 3x5 pour le rendu en image
+_POLICE_CHIFFRES = np.array([[[int(c) for c in ligne] for ligne in chiffre.split()] for chiffre in [
+    "010 110 010 010 111", "111 001 111 100 111", "111 001 111 001 111",
+    "101 101 111 001 001", "111 100 111 001 111", "111 100 111 101 111",
+    "111 001 010 010 010", "111 101 111 101 111", "111 101 111 001 111"]], dtype = bool)
+
+def _rgb(couleur):
+    """
+    Convertit un code hexadécimal '#RRGGBB' en tableau numpy de 3 uint8.
+    """
+    couleur = couleur.lstrip("#")
+    return np.array([int(couleur[k:k + 2], 16) for k in (0, 2, 4)], dtype = np.uint8)
+
+def _fleches(case_px):
+    """
+    Retourne les masques booléens (4, case_px, case_px) des flèches haut, 
+    droite, bas et gauche, dans l'ordre des actions.
+    """
+    y, x = np.mgrid[0:case_px, 0:case_px] + 0.5
+    centre = case_px / 2
+    haut, milieu, bas = 0.15 * case_px, 0.5 * case_px, 0.85 * case_px
+    # Pointe triangulaire et tige de la flèche vers le haut
+    pointe = (y >= haut) & (y <= milieu) & (np.abs(x - centre) <= (y - haut) * 0.8)
+    tige = (y > milieu) & (y <= bas) & (np.abs(x - centre) <= max(case_px / 14, 0.5))
+    fleche = pointe | tige
+    return np.stack([np.rot90(fleche, -k) for k in range(4)])
+
+def _image_grille(tab, chiffre, tab_coul, case_px, mode = "couleur", strategy = None):
+    """
+    Construit l'image RGB d'une grille (ou d'une partie de grille) en une 
+    seule passe NumPy, sans objet Tkinter par case. Chaque combinaison 
+    (contenu de case, flèche) présente dans la grille est dessinée une seule 
+    fois comme tuile de case_px x case_px pixels, puis l'image est assemblée 
+    par indexation. En dessous de 6 pixels par case, les cases sont de 
+    simples aplats de couleur, sans lignes, flèches ni chiffres.
+
+    Parameters
+    ----------
+    tab : numpy.ndarray
+        Tableau des couleurs des cases (-1 pour un mur).
+    chiffre : numpy.ndarray
+        Tableau des chiffres des cases, de la même taille que tab.
+    tab_coul : list(string)
+        Codes hexadécimaux des couleurs.
+    case_px : int
+        La taille en pixels d'une case.
+    mode : string
+        'couleur' (un disque coloré par case) ou 'chiffre' (un chiffre coloré
+        par case). Le défaut est 'couleur'.
+    strategy : numpy.ndarray
+        Stratégie pure de la même taille que tab, dessinée en flèches grises. 
+        Le défaut est None.
+
+    Returns
+    -------
+    numpy.ndarray
+        Image uint8 de taille (nb_lig * case_px + 1, nb_col * case_px + 1, 3)
+        si case_px >= 6, (nb_lig * case_px, nb_col * case_px, 3) sinon.
+    """
+    nb_coul = len(tab_coul)
+    couleurs = np.array([_rgb(c) for c in tab_coul] + [_rgb("#5E5E64")])
+    mur = tab < 0
+    nb_lig, nb_col = tab.shape
+    if case_px < 6:
+        image = couleurs[np.where(mur, nb_coul, tab)]
+        return image.repeat(case_px, axis = 0).repeat(case_px, axis = 1)
+    
+    # Indice de tuile : contenu de la case (couleur, et chiffre en mode 'chiffre') puis flèche (4 si aucune)
+    contenu = np.where(mur, -1, tab if mode == "couleur" else tab * 9 + chiffre - 1)
+    fleche = np.full(tab.shape, 4) if strategy is None else np.where(mur, 4, strategy)
+    tuiles, inverse = np.unique(contenu * 5 + fleche, return_inverse = True)
+    
+    fleches = _fleches(case_px)
+    if mode == "couleur":
+        rayon = max(case_px // 6, 2)
+        y, x = np.mgrid[0:case_px, 0:case_px] - case_px // 2
+        disque = x ** 2 + y ** 2 <= rayon ** 2
+    else:
+        echelle = max(case_px // 10, 1)
+        glyphes = np.zeros((9, case_px, case_px), dtype = bool)
+        y0, x0 = (case_px - 5 * echelle) // 2, (case_px - 3 * echelle) // 2
+        glyphes[:, y0:y0 + 5 * echelle, x0:x0 + 3 * echelle] = _POLICE_CHIFFRES.repeat(echelle, 1).repeat(echelle, 2)
+    
+    banque = np.full((tuiles.size, case_px, case_px, 3), 255, dtype = np.uint8)
+    for k, t in enumerate(tuiles):
+        c, f = divmod(t, 5)
+        if c < 0:
+            banque[k] = couleurs[nb_coul]
+        else:
+            if f < 4:
+                banque[k][fleches[f]] = 200
+            if mode == "couleur":
+                banque[k][disque] = couleurs[c]
+            else:
+                banque[k][glyphes[c % 9]] = couleurs[c // 9]
+    # Lignes du grid en haut et à gauche de chaque tuile
+    banque[:, 0] = 0
+    banque[:, :, 0] = 0
+    
+    image = banque[inverse.reshape(tab.shape)].transpose(0, 2, 1, 3, 4).reshape(nb_lig * case_px, nb_col * case_px, 3)
+    # Lignes de fermeture en bas et à droite
+    image = np.pad(image, ((0, 1), (0, 1), (0, 0)))
+    return image
+
+def _ppm(image):
+    """
+    Encode une image RGB uint8 au format PPM binaire, lisible directement par
+    tkinter.PhotoImage.
+    """
+    return b"P6 %d %d 255 " % (image.shape[1], image.shape[0]) + np.ascontiguousarray(image).tobytes()
+
 class Visualisation():
     """
     Classe créée pour faciliter la visualisation des grilles et la 
@@ -303,6 +1076,9 @@ class Visualisation():
     d’après une politique stationnaire déterministe et utiliser une politique 
     déterministe ou mixte pour le guidage automatique du robot en tapant la 
     touche ‘espace’. 
+    Le rendu 'image' dessine toute la grille dans une seule image (une seule
+    PhotoImage au lieu d'un ou plusieurs objets du canevas par case) avec une
+    vue déplaçable et un zoom, pour les grandes grilles.
     
     Parameters
     ----------
@@ -327,6 +1103,8 @@ class Visualisation():
         Tableau représentant une stratégie. Chaque case contient soit un nombre
         entre 0 et 3 indiquant à quelle case voisine le robot doit aller ou une
         distribution de probabilités pour les cases voisines. 
+    rendu : string
+        'canevas' ou 'image'. Le défaut est 'canevas'.
     """
     
     def __init__(self, grille, tab_coul):   
@@ -335,10 +1113,13 @@ class Visualisation():
         self.tab_coul = tab_coul
         
         
-    def view(self, case_px = 40, mode = "couleur", strategy = None):
+    def view(self, case_px = 40, mode = "couleur", strategy = None, rendu = "canevas", vue_px = 800):
         """
         Permet la visualisation de la grille dans une fenêtre à l’aide du 
         module Tkinter. 
+        En rendu 'image', la grille est affichée par une seule image dans une 
+        vue d'au plus vue_px pixels de côté : les touches '+' et '-' changent
+        le zoom, Maj + flèches déplacent la vue, qui suit aussi le robot.
 
         Parameters
         ----------
@@ -353,20 +1134,39 @@ class Visualisation():
         strategy : numpy.ndarray
             Tableau représentant une stratégie. Peut être 2D (si stratégie 
             pure) ou 3D (si stratégie mixte). The default is None.
+        rendu : string
+            'canevas' (un objet du canevas par case) ou 'image' (une seule 
+            image pour toute la grille). Le défaut est 'canevas'.
+        vue_px : int
+            La taille maximale en pixels de la vue en rendu 'image'. Le défaut
+            est 800.
         """
+        import tkinter as tk
+        assert rendu in ("canevas", "image")
         self.case_px = case_px
         self.strategy = strategy
+        self._mode = mode
+        self._rendu = rendu
+        police = "Verdana " + str(int(-0.5 * case_px)) + " bold"
+        nb_lig, nb_col = self.grille.tab.shape
         
         # On crée la fenêtre de visualisation
-        largeur = (self.grille.tab.shape[1] * self.case_px) + 41
-        hauteur = (self.grille.tab.shape[0] * self.case_px) + 41
+        if rendu == "image":
+            # Zoom initial pour voir toute la grille si possible
+            self.case_px = max(1, min(case_px, vue_px // max(nb_lig, nb_col)))
+            self._vue = (min(nb_lig * self.case_px, vue_px), min(nb_col * self.case_px, vue_px))
+            largeur = self._vue[1] + 41
+            hauteur = self._vue[0] + 41
+        else:
+            largeur = (nb_col * self.case_px) + 41
+            hauteur = (nb_lig * self.case_px) + 41
         window = tk.Tk()
         window.title("MDP")
         self._canevas = tk.Canvas(window, width = largeur, height = hauteur, bg = "#FFFFFF")
         self._canevas.focus_set()
         self._canevas.bind('<Key>', self._clavier)
         self._canevas.pack(padx = 5, pady = 5)
-        w1 = tk.Label(window, text = "Costs: ", fg = "#5E5E64", font = "Verdana " + str(int(-0.5 * self.case_px)) + " bold")
+        w1 = tk.Label(window, text = "Costs: ", fg = "#5E5E64", font = police)
         w1.pack(side = tk.LEFT, padx = 5, pady = 5) 
         
         # On garde ici le(s) coût(s) 
@@ -374,50 +1174,61 @@ class Visualisation():
         # On garde ici les texts pour montrer le(s) coût(s)
         self._costs_labels = []
         
-        # Coordonées du haut à gauche de la case de départ
-        self._x0 = 20
-        self._y0 = 20
-     
-        # On dessine la grille
-        self._dessin_grid(largeur, hauteur)
+        # Case du robot et case du haut à gauche de la vue
+        self._case = (0, 0)
+        self._origine = (0, 0)
         
-        # Si on a une stratégie passé en argument et si c'est une stratégie déterministe alors on dessine des flèches indiquant où aller
-        if strategy is not None and strategy.ndim == 2:
-            # Code ASCII des flèches
-            self._direct = ["\u2191", "\u2192", "\u2193", "\u2190"]
-            self._dessin_fleche() 
+        # Code ASCII des flèches
+        self._direct = ["\u2191", "\u2192", "\u2193", "\u2190"]
+        
+        if rendu == "image":
+            # Une seule image pour la grille, les couleurs/chiffres et les flèches
+            self._image = self._canevas.create_image(20, 20, anchor = "nw")
+            self._dessin_image()
+            if strategy is not None and strategy.ndim == 2:
+                self.fleche_pion = self._canevas.create_text(0, 0, anchor = "center", text = self._direct[self.strategy[0,0]], fill = "#C8C8C8")
+        else:
+            # On dessine la grille
+            self._dessin_grid(largeur, hauteur)
+            
+            # Si on a une stratégie passé en argument et si c'est une stratégie déterministe alors on dessine des flèches indiquant où aller
+            if strategy is not None and strategy.ndim == 2:
+                self._dessin_fleche() 
         
         # Correspond à la grille présenté dans la partie 2 et 3 du projet
         if mode == "couleur":
             # Text où on montre la valeur totale des coûts pour la grille de type "chiffre"
             self._totalcosts = None 
-            self._dessin_couleur()
+            if rendu == "canevas":
+                self._dessin_couleur()
             self._costs.append(0)
             #print("self._costs ", self._costs)
-            wg = tk.Label(window, text = self._costs[0], fg = "#5E5E64", font = "Verdana " + str(int(-0.5 * self.case_px)) + " bold")
+            wg = tk.Label(window, text = self._costs[0], fg = "#5E5E64", font = police)
             wg.pack(side = tk.LEFT, padx = 5, pady = 5)
             self._costs_labels.append(wg)
             
         # Correspond à la grille présenté dans la partie 4 du projet     
         elif mode == "chiffre":
-            self._dessin_chiffre()
+            if rendu == "canevas":
+                self._dessin_chiffre()
             # On a un coût séparé par couleur
             for i in range(len(self.tab_coul)):
                 self._costs.append(0)
-                wg = tk.Label(window, text = self._costs[i], fg = self.tab_coul[i], font = "Verdana " + str(int(-0.5 * self.case_px)) + " bold")
+                wg = tk.Label(window, text = self._costs[i], fg = self.tab_coul[i], font = police)
                 wg.pack(side = tk.LEFT, padx = 5, pady = 5) 
                 self._costs_labels.append(wg)
-            w2 = tk.Label(window, text = "Total costs: ", fg = "#5E5E64", font = "Verdana " + str(int(-0.5 * self.case_px)) + " bold")
+            w2 = tk.Label(window, text = "Total costs: ", fg = "#5E5E64", font = police)
             w2.pack(side = tk.LEFT, padx = 5, pady = 5) 
-            self._totalcosts = tk.Label(window, text = str(sum(self._costs)), fg = "#5E5E64", font = "Verdana " + str(int(-0.5 * self.case_px)) + " bold")
+            self._totalcosts = tk.Label(window, text = str(sum(self._costs)), fg = "#5E5E64", font = police)
             self._totalcosts.pack(side = tk.LEFT, padx = 5, pady = 5) 
 
         # Le robot 
-        self._pion = self._canevas.create_oval(self._x0, self._y0, self._x0 + self.case_px, self._y0 + self.case_px, width = 2, outline = "black", fill = "yellow")
+        self._pion = self._canevas.create_oval(0, 0, 0, 0, width = 2, outline = "black", fill = "yellow")
         
         # Si on dessine les flèches de la stratégie, alors on dessine aussi une flèche specialle sur le robot pour que l'action optimale reste visible 
         if strategy is not None and strategy.ndim == 2: 
             self._canevas.tag_raise(self.fleche_pion)
+        self._placer_pion()
         
         # Boutons pour fermer la fenêtre et pour reinicialiser le parcours du robot
         tk.Button(window, text = "Quit", command = window.destroy).pack(side = tk.RIGHT, padx = 5, pady = 5)
@@ -432,18 +1243,97 @@ class Visualisation():
         """
         Réinitialise la visualisation de la grille. 
         """
-        self._x0 = 20
-        self._y0 = 20
-        self._canevas.coords(self._pion, self._x0, self._y0, self._x0 + self.case_px, self._y0 + self.case_px)
+        self._case = (0, 0)
+        self._placer_pion()
         for i in range(len(self._costs_labels)):
             self._costs[i] = 0
             self._costs_labels[i].config(text = str(self._costs[i]))
         if self._totalcosts is not None:
             self._totalcosts.config(text = str(sum(self._costs)))
+            
+    def _placer_pion(self, recentrer = True):
+        """
+        Place le robot (et la flèche en dessus si elle existe) sur sa case. En
+        rendu 'image' et si recentrer, la vue est recentrée sur le robot s'il
+        en sort ; sinon le robot est caché tant que sa case est hors de la 
+        vue, et coupé au bord de la vue.
+        """
+        i, j = self._case
+        x1, y1 = np.inf, np.inf
+        etat = "normal"
+        if self._rendu == "image":
+            nb_i, nb_j = self._nb_visibles()
+            i0, j0 = self._origine
+            if not (i0 <= i < i0 + nb_i and j0 <= j < j0 + nb_j):
+                if recentrer:
+                    self._origine = (i - nb_i // 2, j - nb_j // 2)
+                    self._dessin_image()
+                else:
+                    etat = "hidden"
+            x1, y1 = 20 + self._vue[1], 20 + self._vue[0]
+        i0, j0 = self._origine
+        x0 = 20 + (j - j0) * self.case_px
+        y0 = 20 + (i - i0) * self.case_px
+        x1, y1 = min(x0 + self.case_px, x1), min(y0 + self.case_px, y1)
+        self._canevas.coords(self._pion, x0, y0, x1, y1)
+        self._canevas.itemconfig(self._pion, state = etat)
         # Si on dessine les flèches de la stratégie, alors on dessine aussi une flèche specialle sur le robot pour que l'action optimale reste visible 
         if self.strategy is not None and self.strategy.ndim == 2: 
-            self._canevas.itemconfig(self.fleche_pion, text = self._direct[self.strategy[0, 0]])
-            self._canevas.coords(self.fleche_pion, self._x0 + self.case_px // 2, self._y0 + self.case_px // 2) 
+            self._canevas.itemconfig(self.fleche_pion, text = self._direct[self.strategy[i, j]], font = "Verdana " + str(int(-0.9 * self.case_px)) + " bold", state = etat)
+            self._canevas.coords(self.fleche_pion, (x0 + x1) // 2, (y0 + y1) // 2) 
+            
+    def _nb_visibles(self):
+        """
+        Nombre de lignes et de colonnes de cases visibles dans la vue.
+        """
+        return (-(-self._vue[0] // self.case_px), -(-self._vue[1] // self.case_px))
+    
+    def _dessin_image(self):
+        """
+        Dessine la partie visible de la grille dans l'unique image du canevas
+        (rendu 'image'), après avoir ramené la vue dans les limites de la 
+        grille.
+        """
+        import tkinter as tk
+        nb_lig, nb_col = self.grille.tab.shape
+        nb_i, nb_j = self._nb_visibles()
+        i0 = min(max(self._origine[0], 0), max(nb_lig - nb_i, 0))
+        j0 = min(max(self._origine[1], 0), max(nb_col - nb_j, 0))
+        self._origine = (i0, j0)
+        zone = (slice(i0, i0 + nb_i), slice(j0, j0 + nb_j))
+        strategy = self.strategy[zone] if self.strategy is not None and self.strategy.ndim == 2 else None
+        image = _image_grille(self.grille.tab[zone], self.grille.chiffre[zone], self.tab_coul, self.case_px, self._mode, strategy)
+        image = image[:self._vue[0] + 1, :self._vue[1] + 1]
+        # On garde une référence à la PhotoImage, sinon Tkinter l'efface
+        self._photo = tk.PhotoImage(data = _ppm(image))
+        self._canevas.itemconfig(self._image, image = self._photo)
+    
+    def _zoomer(self, facteur):
+        """
+        Multiplie la taille des cases par facteur en gardant le centre de la 
+        vue (rendu 'image').
+        """
+        case_px = min(max(int(self.case_px * facteur), 1), 64)
+        if case_px == self.case_px:
+            return
+        nb_i, nb_j = self._nb_visibles()
+        centre = (self._origine[0] + nb_i // 2, self._origine[1] + nb_j // 2)
+        self.case_px = case_px
+        nb_i, nb_j = self._nb_visibles()
+        self._origine = (centre[0] - nb_i // 2, centre[1] - nb_j // 2)
+        self._dessin_image()
+        self._placer_pion()
+    
+    def _deplacer_vue(self, action):
+        """
+        Déplace la vue d'un quart de sa taille dans la direction de l'action
+        (rendu 'image').
+        """
+        nb_i, nb_j = self._nb_visibles()
+        di, dj = DEPLACEMENTS[action]
+        self._origine = (self._origine[0] + di * max(nb_i // 4, 1), self._origine[1] + dj * max(nb_j // 4, 1))
+        self._dessin_image()
+        self._placer_pion(recentrer = False)
             
     def _clavier(self, event):
         """
@@ -453,14 +1343,17 @@ class Visualisation():
         # Traduction des touches vers les chiffres
         dict_dir = {"Up": 0, "Right": 1, "Down": 2, "Left": 3}
         touche = event.keysym
+        # En rendu 'image', Maj + flèches déplacent la vue et +/- changent le zoom
+        if self._rendu == "image" and touche in dict_dir and event.state & 1:
+            self._deplacer_vue(dict_dir[touche])
+        elif self._rendu == "image" and touche in ("plus", "equal", "KP_Add", "minus", "KP_Subtract"):
+            self._zoomer(2 if touche in ("plus", "equal", "KP_Add") else 0.5)
         # Si une des flèches, on la passe à la fonction _move directement
-        if touche in dict_dir:
+        elif touche in dict_dir:
             self._move(dict_dir[touche])
         # Sinon et si on a une stratégie, on tire une flèche soit de façon déterministe, soit d'après la loi de probabilité de la case courante 
         elif touche == "space" and self.strategy is not None:
-            j = round((self._x0 - 20) / self.case_px)
-            i = round((self._y0 - 20) / self.case_px)
-            strat = self.strategy[i,j]
+            strat = self.strategy[self._case]
             if self.strategy.ndim != 2:
                 strat = np.random.choice(4, p = strat)  
             self._move(strat)
@@ -469,22 +1362,15 @@ class Visualisation():
         """
         Bouge le robot et la flèche en dessus si elle existe. 
         """
-        j = round((self._x0 - 20) / self.case_px)
-        i = round((self._y0 - 20) / self.case_px)
+        i, j = self._case
     
         cases, p = zip(*self.grille.proba_trans(i, j, action).items())
         place = random.choices(cases, p)[0]
 
         if place == (i, j):
             return
-        self._x0 = 20 + place[1] * self.case_px
-        self._y0 = 20 + place[0] * self.case_px
-        
-        self._canevas.coords(self._pion, self._x0, self._y0, self._x0 + self.case_px, self._y0 + self.case_px)
-
-        if self.strategy is not None and self.strategy.ndim == 2:
-            self._canevas.itemconfig(self.fleche_pion, text = self._direct[self.strategy[place]])
-            self._canevas.coords(self.fleche_pion, self._x0 + self.case_px // 2, self._y0 + self.case_px // 2) 
+        self._case = place
+        self._placer_pion()
         
         # Si on a _totalcosts, alors on est dans le 2ème type de grille avec des poids séparés par couleur
         if self._totalcosts is not None:
@@ -562,9 +1448,11 @@ class Visualisation():
                 else:
                     self._canevas.create_rectangle(x0, y0, x0 + self.case_px, y0 + self.case_px, fill = "#5E5E64")       
 
-def simulation(grille, strategy, gamma, bonus, mode = "couleur", maxIter = 10000, init_robot = (0, 0)):
+def simulation(grille, strategy, gamma, bonus, mode = "couleur", maxIter = 10000, init_robot = (0, 0), seed = None):
     """
-    Simule une stratégie pure ou mixte sur une grille.
+    Simule une stratégie pure ou mixte sur une grille. L'épisode est simulé 
+    pas à pas avec les tables de Grille.tables_cumulees ; pour beaucoup 
+    d'épisodes, simulation_lot est bien plus rapide.
     
     Parameters
     ----------
@@ -586,6 +1474,8 @@ def simulation(grille, strategy, gamma, bonus, mode = "couleur", maxIter = 10000
         Nombre maximal d'itérations.
     init_robot : tuple(int, int)
         Position initiale du robot.
+    seed : None, int ou numpy.random.Generator
+        Graine ou générateur aléatoire utilisé. Le défaut est None.
 
     Returns
     -------
@@ -594,48 +1484,374 @@ def simulation(grille, strategy, gamma, bonus, mode = "couleur", maxIter = 10000
         'chiffre').
     """
     assert mode in ["couleur", "chiffre"], "Le mode doit être 'couleur' ou 'chiffre'"
-    robot = init_robot
-    gamma_iter = 1
-    cpt_iter = 0
-    pure = strategy.ndim == 2
-    but = (grille.tab.shape[0] - 1, grille.tab.shape[1] - 1)
+    rng = np.random.default_rng(seed)
+    cases, cumul = grille.tables_cumulees()
+    cout_case = grille.vecteur_cout(mode)
+    depart = init_robot[0] * grille.tab.shape[1] + init_robot[1]
+    cout = _simuler_episode(cases, cumul, cout_case, strategy, depart, gamma, bonus, maxIter, rng)
     if mode == "couleur":
-        cout = 0
+        return cout
     else:
-        cout = [0]*len(grille.tab_cost)
+        return cout.tolist()
+
+def simulation_lot(grille, strategy, gamma, bonus, nb_episodes, mode = "couleur", maxIter = 10000, init_robot = (0, 0), seed = None):
+    """
+    Simule plusieurs épisodes indépendants d'une stratégie pure ou mixte sur
+    une grille. Tous les robots avancent en même temps : à chaque pas, les 
+    actions (pour une stratégie mixte) et les cases d'arrivée sont tirées de
+    façon vectorisée par inversion de la fonction de répartition, à l'aide de
+    Grille.tables_cumulees.
+    
+    Parameters
+    ----------
+    grille : Grille
+        La grille sur laquelle on veut tester la stratégie.
+    strategy : numpy.ndarray
+        La stratégie à tester.
+    gamma : float
+        Le gamma (taux d'amortissement) utilisé dans le calcul.
+    bonus : int
+        Le bonus reçu (une seule fois) dans la case cible. Lié avec le
+        paramètre M par bonus = M/(1-gamma).
+    nb_episodes : int
+        Nombre d'épisodes simulés.
+    mode : string
+        Le mode de calcul : 'couleur' ou 'chiffre' (voir simulation).
+    maxIter : int
+        Nombre maximal d'itérations de chaque épisode.
+    init_robot : tuple(int, int)
+        Position initiale des robots.
+    seed : None, int ou numpy.random.Generator
+        Graine ou générateur aléatoire utilisé. Le défaut est None.
+
+    Returns
+    -------
+    couts : numpy.ndarray
+        Le cout observé dans chaque épisode : tableau de taille nb_episodes en
+        mode 'couleur', de taille (nb_episodes, nb_couleurs) en mode 
+        'chiffre'.
+    stats : dict
+        Statistiques des épisodes : 'moyenne' et 'ecart_type' des couts, 
+        'intervalle' (intervalle de confiance à 95% de la moyenne), 
+        'taux_arrivee' (proportion des épisodes arrivés à la case but) et 
+        'nb_pas_moyen'.
+    """
+    assert mode in ["couleur", "chiffre"], "Le mode doit être 'couleur' ou 'chiffre'"
+    rng = np.random.default_rng(seed)
+    cases, cumul = grille.tables_cumulees()
+    depart = init_robot[0] * grille.tab.shape[1] + init_robot[1]
+    debut = time.perf_counter()
+    couts, nb_pas, arrives = _simuler(cases, cumul, grille.vecteur_cout(mode), _strat_tirage(strategy), 
+                                      depart, gamma, bonus, nb_episodes, maxIter, rng)
+    stats = _stats_simulation(couts, nb_pas, arrives)
+    _enregistrer("simulation_lot", dict(stats, nb_episodes = nb_episodes, total = time.perf_counter() - debut))
+    return couts, stats
+
+def _strat_tirage(strategy):
+    """
+    Retourne la stratégie sous la forme utilisée par _simuler : tableau 1D 
+    des actions pour une stratégie pure, tableau (nb_cases, 4) des 
+    probabilités cumulées pour une stratégie mixte.
+    """
+    if strategy.ndim == 2:
+        return strategy.ravel()
+    strat = strategy.reshape(-1, 4).cumsum(1)
+    strat[:, -1] = 1
+    return strat
 
+def _simuler_episode(cases, cumul, cout_case, strategy, depart, gamma, bonus, maxIter, rng):
+    """
+    Simule un seul épisode avec des opérations scalaires, comme _simuler 
+    mais sans le coût fixe des opérations sur des tableaux à chaque pas. 
+    Retourne le cout observé.
+    """
+    but = cases.shape[0] // 4 - 1
+    pure = strategy.ndim == 2
+    strat = strategy.reshape(-1) if pure else strategy.reshape(-1, 4)
+    K = cases.shape[1]
+    robot = depart
+    cout = 0. if cout_case.ndim == 1 else np.zeros(cout_case.shape[1])
+    gamma_iter = 1.
+    cpt_iter = 0
     while robot != but and cpt_iter < maxIter:
         cpt_iter += 1
         
         # Coût de sortie de la case
-        cout_case = grille.case_cout(*robot, mode)
-        if mode == "couleur":
-            cout += gamma_iter * cout_case
-        else:
-            cout[cout_case[1]] += gamma_iter * cout_case[0]
+        cout += gamma_iter * cout_case[robot]
         gamma_iter *= gamma
         
-        # Mouvement vers la prochaine case
+        # Mouvement vers la prochaine case, par inversion de la fonction de
+        # répartition comme dans _simuler
         if pure:
-            direction = strategy[robot]
+            direction = strat.item(robot)
         else:
-            direction = np.random.choice(4, p = strategy[robot])
-        dict_probas = grille.proba_trans(*robot, direction)
-        cases, p = zip(*dict_probas.items())
-        robot = random.choices(cases, p)[0]
-        
-    # Récompense d'arrivée de la case but et retour :
-    if mode == "couleur":
-        return gamma_iter * bonus - cout
-    else:
-        return [gamma_iter * bonus - ci for ci in cout]
+            u = rng.random()
+            direction = 0
+            cumul_action = strat.item(robot, 0)
+            while direction < 3 and u >= cumul_action:
+                direction += 1
+                cumul_action += strat.item(robot, direction)
+        ligne = robot * 4 + direction
+        u = rng.random()
+        k = 0
+        while k < K - 1 and u >= cumul.item(ligne, k):
+            k += 1
+        robot = cases.item(ligne, k)
+    
+    # Récompense d'arrivée de la case but
+    return gamma_iter * bonus - cout
 
-def pol_valeur(grille, gamma, M, eps = 1e-5, mode = "couleur"):
+def _simuler(cases, cumul, cout_case, strat, depart, gamma, bonus, nb_episodes, maxIter, rng):
     """
-    Calcule la stratégie optimale pour une grille donnée avec un gamma et une 
-    récompense finale passées en argument, en utilisant l'algorithme 
-    d'itération de la valeur. Le critère d'arrêt de l'approximation est aussi 
-    passé en argument, ainsi que le mode (i.e quel coûts utiliser pour le 
+    Simule nb_episodes épisodes en même temps à partir des tables de 
+    Grille.tables_cumulees, des coûts de Grille.vecteur_cout et d'une 
+    stratégie donnée par _strat_tirage.
+
+    Returns
+    -------
+    couts : numpy.ndarray
+        Le cout observé dans chaque épisode.
+    nb_pas : numpy.ndarray
+        Le nombre de pas de chaque épisode.
+    arrives : numpy.ndarray
+        Masque des épisodes arrivés à la case but.
+    """
+    but = cases.shape[0] // 4 - 1
+    pure = strat.ndim == 1
+    robots = np.full(nb_episodes, depart)
+    cout = np.zeros((nb_episodes, *cout_case.shape[1:]))
+    nb_pas = np.full(nb_episodes, maxIter)
+    # Indices des épisodes pas encore arrivés à la case but
+    en_cours = np.flatnonzero(robots != but)
+    nb_pas[robots == but] = 0
+    gamma_iter = 1
+    cpt_iter = 0
+    while en_cours.size > 0 and cpt_iter < maxIter:
+        cpt_iter += 1
+        pos = robots[en_cours]
+        
+        # Coût de sortie de la case
+        cout[en_cours] += gamma_iter * cout_case[pos]
+        gamma_iter *= gamma
+        
+        # Mouvement vers la prochaine case
+        if pure:
+            direction = strat[pos]
+        else:
+            u = rng.random(pos.size)
+            direction = (u[:, None] >= strat[pos]).sum(1)
+        lignes = pos * 4 + direction
+        u = rng.random(pos.size)
+        k = (u[:, None] >= cumul[lignes]).sum(1)
+        pos = cases[lignes, k]
+        robots[en_cours] = pos
+        
+        arrives = pos == but
+        nb_pas[en_cours[arrives]] = cpt_iter
+        en_cours = en_cours[~arrives]
+    
+    # Récompense d'arrivée de la case but (avec le même amortissement que 
+    # simulation pour les épisodes qui n'arrivent pas)
+    recompense = bonus * gamma ** nb_pas.astype(float)
+    if cout.ndim == 1:
+        couts = recompense - cout
+    else:
+        couts = recompense[:, None] - cout
+    return couts, nb_pas, robots == but
+
+def _stats_simulation(couts, nb_pas, arrives):
+    """
+    Calcule les statistiques retournées par simulation_lot.
+    """
+    nb_episodes = couts.shape[0]
+    moyenne = couts.mean(0)
+    ecart_type = couts.std(0, ddof = 1) if nb_episodes > 1 else np.zeros_like(moyenne)
+    demi_largeur = 1.96 * ecart_type / np.sqrt(nb_episodes)
+    return {"moyenne": moyenne,
+            "ecart_type": ecart_type,
+            "intervalle": (moyenne - demi_largeur, moyenne + demi_largeur),
+            "taux_arrivee": arrives.mean(),
+            "nb_pas_moyen": nb_pas.mean()}
+
+# Tableaux partagés attachés par chaque processus de simulation_parallele :
+# nom -> (SharedMemory, numpy.ndarray)
+_MEMOIRE_PARTAGEE = {}
+
+def _init_processus(descripteurs):
+    """
+    Attache, dans un processus de calcul, les tableaux mis en mémoire 
+    partagée par simulation_parallele.
+    """
+    from multiprocessing import shared_memory
+    for nom, (nom_shm, forme, dtype) in descripteurs.items():
+        shm = shared_memory.SharedMemory(name = nom_shm)
+        _MEMOIRE_PARTAGEE[nom] = (shm, np.ndarray(forme, dtype = dtype, buffer = shm.buf))
+
+def _simuler_bloc(nb_episodes, graine, depart, gamma, bonus, maxIter):
+    """
+    Simule un bloc d'épisodes dans un processus de calcul, avec les tableaux
+    en mémoire partagée et un générateur aléatoire propre au bloc.
+    """
+    tab = {nom: arr for nom, (_, arr) in _MEMOIRE_PARTAGEE.items()}
+    return _simuler(tab["cases"], tab["cumul"], tab["cout"], tab["strat"], depart, gamma, 
+                    bonus, nb_episodes, maxIter, np.random.default_rng(graine))
+
+def simulation_parallele(grille, strategy, gamma, bonus, nb_episodes, mode = "couleur", maxIter = 10000, 
+                         init_robot = (0, 0), seed = None, nb_processus = None, taille_bloc = 1000):
+    """
+    Simule plusieurs épisodes d'une stratégie pure ou mixte sur une grille, 
+    en répartissant les épisodes sur plusieurs processus. 
+    Les épisodes sont découpés en blocs de taille_bloc épisodes et chaque 
+    bloc a son propre générateur aléatoire, dérivé d'une unique 
+    numpy.random.SeedSequence. Les résultats ne dépendent donc que de seed et
+    de taille_bloc, et pas du nombre de processus. Les tables de transitions,
+    les coûts et la stratégie sont mis en mémoire partagée une seule fois au 
+    lieu d'être envoyés à chaque bloc.
+
+    Parameters
+    ----------
+    grille : Grille
+        La grille sur laquelle on veut tester la stratégie.
+    strategy : numpy.ndarray
+        La stratégie à tester.
+    gamma : float
+        Le gamma (taux d'amortissement) utilisé dans le calcul.
+    bonus : int
+        Le bonus reçu (une seule fois) dans la case cible. Lié avec le
+        paramètre M par bonus = M/(1-gamma).
+    nb_episodes : int
+        Nombre d'épisodes simulés.
+    mode : string
+        Le mode de calcul : 'couleur' ou 'chiffre' (voir simulation).
+    maxIter : int
+        Nombre maximal d'itérations de chaque épisode.
+    init_robot : tuple(int, int)
+        Position initiale des robots.
+    seed : None, int ou numpy.random.SeedSequence
+        Graine à partir de laquelle les générateurs des blocs sont dérivés. 
+        Le défaut est None.
+    nb_processus : int
+        Nombre de processus utilisés. Si None, le nombre de processeurs de la
+        machine. Avec 1, les blocs sont simulés dans le processus courant. Le
+        défaut est None.
+    taille_bloc : int
+        Nombre d'épisodes simulés par bloc. Le défaut est 1000.
+
+    Returns
+    -------
+    couts : numpy.ndarray
+        Le cout observé dans chaque épisode (voir simulation_lot).
+    stats : dict
+        Statistiques des épisodes (voir simulation_lot).
+    """
+    assert mode in ["couleur", "chiffre"], "Le mode doit être 'couleur' ou 'chiffre'"
+    debut = time.perf_counter()
+    from concurrent.futures import ProcessPoolExecutor
+    from multiprocessing import shared_memory
+    if not isinstance(seed, np.random.SeedSequence):
+        seed = np.random.SeedSequence(seed)
+    tailles = [taille_bloc] * (nb_episodes // taille_bloc)
+    if nb_episodes % taille_bloc:
+        tailles.append(nb_episodes % taille_bloc)
+    graines = seed.spawn(len(tailles))
+    
+    cases, cumul = grille.tables_cumulees()
+    tableaux = {"cases": cases, "cumul": cumul, "cout": grille.vecteur_cout(mode), 
+                "strat": _strat_tirage(strategy)}
+    depart = init_robot[0] * grille.tab.shape[1] + init_robot[1]
+    nb_processus = nb_processus or os.cpu_count()
+    
+    if nb_processus == 1 or len(tailles) <= 1:
+        resultats = [_simuler(tableaux["cases"], tableaux["cumul"], tableaux["cout"], tableaux["strat"], 
+                              depart, gamma, bonus, nb, maxIter, np.random.default_rng(graine)) 
+                     for nb, graine in zip(tailles, graines)]
+    else:
+        memoires = []
+        try:
+            descripteurs = {}
+            for nom, arr in tableaux.items():
+                shm = shared_memory.SharedMemory(create = True, size = max(arr.nbytes, 1))
+                memoires.append(shm)
+                np.ndarray(arr.shape, dtype = arr.dtype, buffer = shm.buf)[...] = arr
+                descripteurs[nom] = (shm.name, arr.shape, arr.dtype)
+            with ProcessPoolExecutor(min(nb_processus, len(tailles)), initializer = _init_processus, 
+                                     initargs = (descripteurs,)) as executeur:
+                resultats = list(executeur.map(_simuler_bloc, tailles, graines, 
+                                               *([x] * len(tailles) for x in (depart, gamma, bonus, maxIter))))
+        finally:
+            for shm in memoires:
+                shm.close()
+                shm.unlink()
+    
+    couts, nb_pas, arrives = (np.concatenate(x) for x in zip(*resultats))
+    stats = _stats_simulation(couts, nb_pas, arrives)
+    _enregistrer("simulation_parallele", dict(stats, nb_episodes = nb_episodes, nb_blocs = len(tailles), 
+                                              total = time.perf_counter() - debut))
+    return couts, stats
+
+def evaluer_politique(grille, strategy, gamma, M, mode = "couleur"):
+    """
+    Calcule exactement la valeur d'une stratégie pure ou mixte dans chaque
+    case, par la résolution du système linéaire creux (I - gamma P) v = r, 
+    où P est la chaîne de Markov induite par la stratégie sur les cases qui
+    ne sont ni des murs ni la case but. Comme dans pol_valeur, la case but
+    vaut M/(1-gamma) et les murs valent 0.
+
+    Parameters
+    ----------
+    grille : Grille
+        La Grille sur laquelle on évalue la stratégie.
+    strategy : numpy.ndarray
+        Tableau 2D (stratégie pure) ou 3D (stratégie mixte) représentant la
+        stratégie.
+    gamma : float
+        Le gamma (taux d'amortissement) utilisé dans le calcul.
+    M : int
+        La récompense de la case but.
+    mode : String
+        Avec quel coût évaluer la stratégie : 'couleur', 'somme_chiffre' ou
+        'chiffre'. En mode 'chiffre', la stratégie est évaluée selon le 
+        critère de chaque couleur (poids des cases de cette couleur, M pour
+        la case but). Le défaut est 'couleur'.
+
+    Returns
+    -------
+    numpy.ndarray
+        Tableau 2D des valeurs des cases, ou tableau 3D de taille 
+        (nb_lig, nb_col, nb_couleurs) en mode 'chiffre'.
+    """
+    from scipy.sparse.linalg import spsolve
+    debut = time.perf_counter()
+    nb = grille.tab.size
+    if strategy.ndim == 2:
+        probas = np.eye(4)[strategy.ravel()]
+    else:
+        probas = strategy.reshape(-1, 4)
+    actives = grille.tab.ravel() >= 0
+    actives[-1] = False
+    trans = grille.matrice_trans()
+    # Chaîne de Markov induite : P(s, s’) = somme_a pi(s, a) T(s, a, s’)
+    p_pol = sum(sp.diags(probas[actives, a]) @ trans[a::4][actives] for a in range(4)).tocsr()
+    cout = grille.vecteur_cout(mode)
+    
+    vs = np.zeros((nb,) + cout.shape[1:])
+    vs[-1] = M / (1 - gamma)
+    r = - cout[actives] + gamma * np.multiply.outer(p_pol[:, -1].toarray().ravel(), vs[-1])
+    systeme = (sp.identity(actives.sum(), format = "csr") - gamma * p_pol[:, actives]).tocsc()
+    preparation = time.perf_counter() - debut
+    vs[actives] = spsolve(systeme, r).reshape(r.shape)
+    total = time.perf_counter() - debut
+    _enregistrer("evaluer_politique", {"preparation": preparation, "resolution": total - preparation, 
+                                       "nb_etats": int(actives.sum()), "statut": _statut(vs), "total": total})
+    return vs.reshape(grille.tab.shape + cout.shape[1:])
+
+def pol_valeur(grille, gamma, M, eps = 1e-5, mode = "couleur", methode = "gauss_seidel", elaguer = False, 
+               arret = "norme", elimination = False, rappel = None, stats = False):
+    """
+    Calcule la stratégie optimale pour une grille donnée avec un gamma et une 
+    récompense finale passées en argument, en utilisant l'algorithme 
+    d'itération de la valeur. Le critère d'arrêt de l'approximation est aussi 
+    passé en argument, ainsi que le mode (i.e quel coûts utiliser pour le 
     calcul).
 
     Parameters
@@ -655,6 +1871,63 @@ def pol_valeur(grille, gamma, M, eps = 1e-5, mode = "couleur"):
         l'énoncé).
         'somme_chiffre' calcule la stratégie avec la somme des coûts en chiffre 
         (partie 4a de l'enoncé). Le défaut est 'couleur'.
+    methode : String
+        L'ordre des mises à jour des valeurs. 'gauss_seidel' parcourt les 
+        cases ligne par ligne en réutilisant les valeurs déjà mises à jour 
+        dans la même itération, et donne les mêmes pol et cpt que la boucle
+        case par case d'origine : les cases d'une même anti-diagonale 
+        2i + j, qui ne dépendent pas les unes des autres, sont mises à jour
+        ensemble par un produit avec leurs lignes de la matrice de 
+        transitions. 'jacobi' met à jour toutes les cases en même temps à 
+        chaque itération, avec un seul produit par la matrice de transitions
+        de la grille : une itération est environ 4 fois moins chère, mais il
+        en faut souvent plus. 'gauss_seidel_inverse' parcourt les 
+        anti-diagonales dans l'autre sens, en partant de la case but, et 
+        'distance' met à jour ensemble les cases à la même distance de la 
+        case but (parcours en largeur depuis la case but), par distance 
+        croissante. 'prioritaire' met à jour, par tours, les cases dont le 
+        résidu est le plus grand, et ne remet à jour une case que si ses 
+        successeurs ont changé de plus de eps (voir _balayage_prioritaire) ;
+        dans ce cas cpt est le nombre de mises à jour divisé par le nombre de
+        cases. 
+        Les ordres qui partent de la case but réduisent le nombre de mises à
+        jour quand la valeur de la case but met longtemps à traverser la 
+        grille. Quand la convergence est limitée par gamma ou par les cases 
+        qui n'atteignent pas la case but, toutes les méthodes font à peu près
+        le même nombre de mises à jour et 'jacobi' est la plus rapide. 
+        'prioritaire' sert quand seules quelques régions convergent 
+        lentement, par exemple avec gamma proche de 1. Le défaut est 
+        'gauss_seidel'.
+    elaguer : bool
+        Si True, la stratégie n'est calculée que sur les cases atteignables 
+        depuis la case initiale (voir Grille.accessibilite), dont les valeurs
+        ne dépendent pas des autres cases. Les autres cases reçoivent l'action
+        0. Le défaut est False.
+    arret : String
+        Le critère d'arrêt de la méthode 'jacobi'. 'norme' s'arrête quand les
+        valeurs changent de moins de eps. Avec 'borne' et 'span', eps est la
+        perte maximale tolérée de la stratégie retournée par rapport à la 
+        stratégie optimale, garantie par les bornes classiques : 'borne' 
+        s'arrête quand les valeurs changent de moins de 
+        eps * (1-gamma) / (2*gamma), et 'span' quand l'écart entre le plus 
+        grand et le plus petit changement (semi-norme span, avec la case but
+        qui ne change pas) est inférieur à eps * (1-gamma) / gamma. 'borne' 
+        et 'span' demandent la méthode 'jacobi'. Le défaut est 'norme'.
+    elimination : bool
+        Si True, la méthode 'jacobi' retire définitivement les actions dont 
+        on sait qu'elles ne sont pas optimales (élimination de MacQueen : le
+        majorant de leur valeur est inférieur au minorant de la valeur d'une
+        autre action), et ne calcule plus que les actions restantes. 
+        Seulement avec la méthode 'jacobi'. Le défaut est False.
+    rappel : Function
+        Si donnée, appelée après chaque itération par 
+        rappel(iteration, residu, temps), où residu est le critère comparé à 
+        eps et temps le temps écoulé depuis le début de l'appel. Avec la 
+        méthode 'prioritaire', iteration est le numéro du tour et residu la 
+        plus grande priorité restante. Le défaut est None.
+    stats : bool
+        Si True, retourne aussi les statistiques du calcul. Le défaut est 
+        False.
 
     Returns
     -------
@@ -662,43 +1935,1011 @@ def pol_valeur(grille, gamma, M, eps = 1e-5, mode = "couleur"):
         Tableau 2D représentant une stratégie pure. 
     cpt : int
         La quantité d’itérations avant la convergence de l'algorithme.
+    stats : dict
+        Seulement si stats est True. Temps (en secondes) de préparation des
+        données ('preparation'), de calcul des valeurs ('resolution'), de 
+        calcul de la stratégie ('politique') et total ('total'), nombre 
+        d'itérations ('iterations'), de cases ('nb_etats') et de mises à 
+        jour de cases ('mises_a_jour'), dernier résidu ('residu') et 
+        'statut' : 'converge', ou 'non_fini' si la boucle s'est arrêtée sur
+        des valeurs infinies ou NaN. Ces statistiques sont aussi gardées par
+        les Profilage actifs.
+    """
+    assert methode in ["jacobi", "gauss_seidel", "gauss_seidel_inverse", "distance", "prioritaire"], \
+        "Méthode inconnue : " + str(methode)
+    assert arret in ["norme", "borne", "span"], "Critère d'arrêt inconnu : " + str(arret)
+    assert methode == "jacobi" or (arret == "norme" and not elimination), \
+        "arret et elimination demandent la méthode 'jacobi'"
+    debut = time.perf_counter()
+    infos = {"methode": methode, "residu": None}
+    suivre = _suivi(infos, rappel, debut)
+    vs, actives, trans, cout = _preparer_pd(grille, gamma, M, mode, elaguer)
+    infos["preparation"] = time.perf_counter() - debut
+    nb_etats = int(actives.sum())
+    if methode == "prioritaire":
+        nb_maj = _balayage_prioritaire(vs, actives, trans, cout, gamma, eps, suivre)
+        cpt = -(- nb_maj // max(nb_etats, 1))
+    else:
+        if methode == "jacobi" and arret == "norme" and not elimination:
+            cpt = _iterer_jacobi(vs, actives, trans, cout, gamma, eps, suivre)
+        elif methode == "jacobi":
+            cpt = _iterer_jacobi_bornes(vs, actives, trans, cout, gamma, eps, arret, elimination, suivre)
+        else:
+            if methode == "distance":
+                blocs = _blocs_distance(trans, actives)
+            else:
+                blocs = _blocs_diagonales(actives, grille.tab.shape[1])
+                if methode == "gauss_seidel_inverse":
+                    blocs = blocs[::-1]
+            cpt = _iterer_blocs(vs, actives, trans, cout, gamma, eps, blocs, suivre)
+        nb_maj = cpt * nb_etats
+    infos["resolution"] = time.perf_counter() - debut - infos["preparation"]
+    pol = _pol_gloutonne(grille, vs, actives, trans)
+    infos["politique"] = time.perf_counter() - debut - infos["preparation"] - infos["resolution"]
+    infos["nb_etats"] = nb_etats
+    infos["mises_a_jour"] = nb_maj
+    infos.update(iterations = cpt, statut = _statut(vs, infos["residu"]), total = time.perf_counter() - debut)
+    _enregistrer("pol_valeur", infos)
+    if stats:
+        return pol, cpt, infos
+    return pol, cpt
+
+def _iterer_jacobi_bornes(vs, actives, trans, cout, gamma, eps, arret, elimination, rappel = None):
+    """
+    Itération de la valeur vectorisée avec les critères d'arrêt 'borne' et 
+    'span' et l'élimination d'actions de pol_valeur. Si d = T(v) - v est le 
+    changement des valeurs, la valeur optimale est comprise entre 
+    T(v) + gamma/(1-gamma) min(d) et T(v) + gamma/(1-gamma) max(d) (bornes 
+    de MacQueen). Une action a d'une case est donc sous-optimale dès que 
+    gamma * (max_b P_b v - P_a v) > gamma**2/(1-gamma) * span(d), où P_a v 
+    est l'espérance des valeurs après l'action a. Modifie vs en place et 
+    retourne le nombre d'itérations. Si rappel est donné, il est appelé par 
+    rappel(iteration, ecart) après chaque itération.
+    """
+    nb_act = int(actives.sum())
+    if nb_act == 0:
+        return 1
+    # Lignes de trans dont on calcule la valeur (triées par case), parmi 
+    # lesquelles valides marque celles qui n'ont pas été éliminées depuis
+    lignes = np.arange(nb_act * 4)
+    trans_calculees = trans
+    valides = np.ones(lignes.size, dtype = bool)
+    debuts = np.arange(0, nb_act * 4, 4)
+    if arret == "span":
+        seuil = eps * (1 - gamma) / gamma
+    elif arret == "borne":
+        seuil = eps * (1 - gamma) / (2 * gamma)
+    else:
+        seuil = eps
+    ecart = seuil + 1
+    span = np.inf
+    cpt = 0
+    while ecart > seuil:
+        q = trans_calculees @ vs
+        q[~valides] = - np.inf
+        q_max = np.maximum.reduceat(q, debuts)
+        if elimination and cpt > 0:
+            valides &= q_max[lignes // 4] - q <= gamma / (1 - gamma) * span
+            # On ne refait la matrice que si assez d'actions ont disparu
+            if valides.sum() < 0.9 * valides.size:
+                lignes = lignes[valides]
+                trans_calculees = trans_calculees[np.flatnonzero(valides)]
+                valides = np.ones(lignes.size, dtype = bool)
+                debuts = np.flatnonzero(np.diff(lignes // 4, prepend = -1))
+        d = - cout + gamma * q_max - vs[actives]
+        vs[actives] += d
+        # La case but ne change pas : 0 fait partie des changements
+        d_min, d_max = min(d.min(), 0), max(d.max(), 0)
+        span = d_max - d_min
+        ecart = span if arret == "span" else max(d_max, - d_min)
+        cpt += 1
+        if rappel is not None:
+            rappel(cpt, ecart)
+    return cpt
+
+def _blocs_diagonales(actives, nb_col):
     """
-    vs = np.zeros(grille.tab.shape)
-    vs[-1, -1] = M / (1 - gamma)
+    Découpe les cases actives (numérotées par leur rang parmi les cases 
+    actives) en anti-diagonales 2i + j croissantes. Une case ne mène qu'à 
+    son voisinage 3x3 : dans le parcours ligne par ligne, elle utilise les 
+    nouvelles valeurs des cases d'anti-diagonale plus petite et les 
+    anciennes valeurs des autres, et deux cases de la même anti-diagonale ne
+    sont jamais voisines.
+    """
+    i, j = np.divmod(np.flatnonzero(actives), nb_col)
+    diagonale = 2 * i + j
+    ordre = np.argsort(diagonale, kind = "stable")
+    return np.split(ordre, np.flatnonzero(np.diff(diagonale[ordre])) + 1)
+
+def _iterer_blocs(vs, actives, trans, cout, gamma, eps, blocs, rappel = None):
+    """
+    Itération de la valeur en place par blocs de cases (voir pol_valeur) : 
+    à chaque itération, les blocs sont mis à jour l'un après l'autre, les 
+    cases d'un bloc en même temps. Modifie vs en place et retourne le nombre
+    d'itérations. Si rappel est donné, il est appelé par 
+    rappel(iteration, erreur) après chaque itération.
+    """
+    etats = np.flatnonzero(actives)
+    ordre = np.concatenate(blocs) if blocs else np.zeros(0, dtype = int)
+    # Lignes de trans dans l'ordre des blocs, pour découper chaque bloc en
+    # tranche contiguë
+    trans_ordre = trans[(ordre[:, None] * 4 + np.arange(4)).ravel()]
+    bornes = np.cumsum([0] + [bloc.size for bloc in blocs])
+    tranches = [(trans_ordre[4 * a:4 * b], cout[ordre[a:b]], etats[ordre[a:b]]) 
+                for a, b in zip(bornes[:-1], bornes[1:])]
     erreur = 1 + eps
     cpt = 0
     while erreur > eps:
-        erreur = 0
-        for i in range(vs.shape[0]):
-            for j in range(vs.shape[1]):
-                if grille.tab[i, j] >= 0 and (i, j) != (vs.shape[0] - 1, vs.shape[1] - 1):
-                    qat = - np.inf
-                    cout = grille.case_cout(i, j, mode)
-                    for a in range(4):
-                        cases_p = grille.proba_trans(i, j, a)
-                        q = sum([p * vs[c] for c, p in cases_p.items()])
-                        qat = max(qat, q)
-                    new_vs = - cout + gamma * qat
-                    erreur = max(erreur, abs(vs[i, j] - new_vs))
-                    vs[i, j] = new_vs
+        erreur = 0.
+        for trans_bloc, cout_bloc, etats_bloc in tranches:
+            q = trans_bloc @ vs
+            new_vs = - cout_bloc + gamma * np.maximum(np.maximum(q[0::4], q[1::4]), np.maximum(q[2::4], q[3::4]))
+            erreur = max(erreur, np.abs(vs[etats_bloc] - new_vs).max(initial = 0))
+            vs[etats_bloc] = new_vs
         cpt += 1
-     
-    pol = np.zeros(grille.tab.shape, dtype = int)
+        if rappel is not None:
+            rappel(cpt, erreur)
+    return cpt
+
+def _iterer_jacobi(vs, actives, trans, cout, gamma, eps, rappel = None):
+    """
+    Itération de la valeur vectorisée (voir pol_valeur), jusqu'à ce que les
+    valeurs changent de moins de eps. Modifie vs en place et retourne le 
+    nombre d'itérations. Si rappel est donné, il est appelé par 
+    rappel(iteration, erreur) après chaque itération.
+    """
+    erreur = 1 + eps
+    cpt = 0
+    while erreur > eps:
+        # Une itération : produit matrice-vecteur puis max sur les 4 actions
+        new_vs = - cout + gamma * (trans @ vs).reshape(-1, 4).max(1)
+        erreur = np.abs(vs[actives] - new_vs).max(initial = 0)
+        vs[actives] = new_vs
+        cpt += 1
+        if rappel is not None:
+            rappel(cpt, erreur)
+    return cpt
+
+def pol_valeur_mo(grille, gamma, M, poids = None, eps = 1e-5, elaguer = False, rappel = None, stats = False):
+    """
+    Itération de la valeur multi-objectifs (partie 4 de l'énoncé) : les 
+    valeurs des cases selon le critère de chaque couleur sont gardées dans 
+    un tableau de taille (nb_cases, nb_couleurs) et mises à jour toutes en 
+    même temps à chaque itération. L'action choisie dans chaque case est 
+    celle qui maximise la somme pondérée des critères par poids, et les 
+    valeurs de chaque critère suivent cette action. C'est une approximation 
+    rapide de pol_pl_mixte_mo pour les grandes grilles.
+
+    Parameters
+    ----------
+    grille : Grille
+        La Grille pour laquelle on calcule la stratégie.
+    gamma : float
+        Le gamma (taux d'amortissement) utilisé dans le calcul.
+    M : int
+        La récompense de la case but, selon chaque critère.
+    poids : list(float)
+        Les poids de chaque critère (couleur) dans la somme pondérée. Si 
+        None, tous les critères ont le même poids. Comme chaque critère 
+        reçoit M dans la case but (convention de pol_pl_mixte_mo), on obtient
+        alors la stratégie de pol_valeur en mode 'somme_chiffre' avec la 
+        récompense nb_couleurs * M, et pas M. Le défaut est None.
+    eps : float
+        Le critère d'arrêt utilisé dans le calcul. Le défaut est 1e-5.
+    elaguer : bool
+        Si True, la stratégie n'est calculée que sur les cases atteignables 
+        depuis la case initiale (voir pol_valeur). Le défaut est False.
+    rappel : Function
+        Si donnée, appelée après chaque itération par 
+        rappel(iteration, residu, temps), où residu est le plus grand 
+        changement des valeurs sur tous les critères (voir pol_valeur). Le 
+        défaut est None.
+    stats : bool
+        Si True, retourne aussi les statistiques du calcul (voir 
+        pol_valeur). Le défaut est False.
+
+    Returns
+    -------
+    pol : numpy.ndarray
+        Tableau 2D représentant une stratégie pure.
+    valeurs : numpy.ndarray
+        Tableau 3D de taille (nb_lig, nb_col, nb_couleurs) des valeurs des 
+        cases selon chaque critère.
+    cpt : int
+        La quantité d’itérations avant la convergence de l'algorithme.
+    stats : dict
+        Seulement si stats est True. Les mêmes statistiques que pol_valeur.
+    """
+    debut = time.perf_counter()
+    infos = {"residu": None}
+    suivre = _suivi(infos, rappel, debut)
+    nb_coul = len(grille.tab_cost)
+    poids = np.ones(nb_coul) if poids is None else np.asarray(poids, dtype = float)
+    vs, actives, trans, cout = _preparer_pd(grille, gamma, M, "chiffre", elaguer)
+    vs = np.repeat(vs[:, None], nb_coul, axis = 1)
+    lignes = np.arange(actives.sum())
+    infos["preparation"] = time.perf_counter() - debut
+    erreur = 1 + eps
+    cpt = 0
+    while erreur > eps:
+        q = (trans @ vs).reshape(-1, 4, nb_coul)
+        actions = (q @ poids).argmax(1)
+        new_vs = - cout + gamma * q[lignes, actions]
+        erreur = np.abs(vs[actives] - new_vs).max(initial = 0)
+        vs[actives] = new_vs
+        cpt += 1
+        suivre(cpt, erreur)
+    
+    infos["resolution"] = time.perf_counter() - debut - infos["preparation"]
+    pol = _pol_gloutonne(grille, vs @ poids, actives, trans)
+    infos["politique"] = time.perf_counter() - debut - infos["preparation"] - infos["resolution"]
+    infos.update(nb_etats = lignes.size, mises_a_jour = cpt * lignes.size, iterations = cpt, 
+                 statut = _statut(vs), total = time.perf_counter() - debut)
+    _enregistrer("pol_valeur_mo", infos)
+    if stats:
+        return pol, vs.reshape(grille.tab.shape + (nb_coul,)), cpt, infos
+    return pol, vs.reshape(grille.tab.shape + (nb_coul,)), cpt
+
+def pol_valeur_lot(grilles, gamma, M, eps = 1e-5, mode = "couleur", rappel = None, stats = False):
+    """
+    Itération de la valeur (méthode 'jacobi' de pol_valeur) sur un lot de 
+    grilles de même taille, toutes en même temps : les cases de toutes les 
+    grilles sont mises à jour par un seul produit avec la matrice de 
+    transitions diagonale par blocs du lot. Les grilles qui ont convergé ne 
+    sont plus mises à jour. Le résultat est le même que celui de pol_valeur
+    appelée sur chaque grille avec methode = 'jacobi', sans le coût fixe de
+    chaque appel.
+
+    Parameters
+    ----------
+    grilles : list(Grille)
+        Les grilles, toutes de la même taille (par exemple créées par 
+        Grille.lot).
+    gamma, M, eps, mode :
+        Voir pol_valeur.
+    rappel : Function
+        Si donnée, appelée après chaque itération du lot par 
+        rappel(iteration, residu, temps), où residu est le plus grand 
+        changement des valeurs des grilles qui n'avaient pas encore convergé
+        (voir pol_valeur). Le défaut est None.
+    stats : bool
+        Si True, retourne aussi les statistiques du calcul (voir 
+        pol_valeur). Le défaut est False.
+
+    Returns
+    -------
+    pols : numpy.ndarray
+        Tableau de taille (nb_grilles, nb_lig, nb_col) des stratégies pures.
+    cpts : numpy.ndarray
+        Nombre d'itérations avant la convergence de chaque grille.
+    stats : dict
+        Seulement si stats est True. Les statistiques de pol_valeur pour 
+        tout le lot, avec le nombre de grilles ('nb_grilles') ; 
+        'iterations' est le nombre d'itérations du lot (le plus grand de 
+        cpts).
+    """
+    debut = time.perf_counter()
+    infos = {"residu": None}
+    suivre = _suivi(infos, rappel, debut)
+    tabs = np.stack([grille.tab for grille in grilles])
+    nb_grilles, lig, col = tabs.shape
+    nb = lig * col
+    trans = _transitions(tabs, np.array([grille.p for grille in grilles], dtype = float))
+    cout = np.concatenate([grille.vecteur_cout(mode) for grille in grilles])
+    vs = np.zeros(nb_grilles * nb)
+    vs[nb - 1::nb] = M / (1 - gamma)
+    actives = tabs.reshape(nb_grilles, nb) >= 0
+    actives[:, -1] = False
+    actives = actives.ravel()
+    grille_de = np.repeat(np.arange(nb_grilles), nb)
+    
+    infos["preparation"] = time.perf_counter() - debut
+    en_cours = np.ones(nb_grilles, dtype = bool)
+    en_cours_prec = None
+    cpts = np.zeros(nb_grilles, dtype = int)
+    nb_maj = 0
+    iteration = 0
+    while en_cours.any():
+        # Les lignes des grilles qui ont convergé sont retirées
+        if en_cours_prec is None or not np.array_equal(en_cours, en_cours_prec):
+            etats = np.flatnonzero(actives & en_cours[grille_de])
+            trans_etats = trans[(etats[:, None] * 4 + np.arange(4)).ravel()]
+            cout_etats = cout[etats]
+            # Début des cases de chaque grille (qui en a) dans etats
+            grilles_etats, debuts = np.unique(grille_de[etats], return_index = True)
+            en_cours_prec = en_cours.copy()
+        # Le max sur les 4 actions est pris entre tranches, plus rapide 
+        # qu'une réduction sur un axe de taille 4
+        q = trans_etats @ vs
+        new_vs = - cout_etats + gamma * np.maximum(np.maximum(q[0::4], q[1::4]), np.maximum(q[2::4], q[3::4]))
+        erreur = np.zeros(nb_grilles)
+        if etats.size > 0:
+            erreur[grilles_etats] = np.maximum.reduceat(np.abs(vs[etats] - new_vs), debuts)
+        vs[etats] = new_vs
+        cpts[en_cours] += 1
+        en_cours &= erreur > eps
+        nb_maj += etats.size
+        iteration += 1
+        suivre(iteration, erreur.max())
+    
+    infos["resolution"] = time.perf_counter() - debut - infos["preparation"]
+    pols = np.zeros(nb_grilles * nb, dtype = int)
+    pols[actives] = (trans[np.repeat(actives, 4)] @ vs).reshape(-1, 4).argmax(1)
+    pols = pols.reshape(nb_grilles, lig, col)
+    pols[:, -1, -1] = 1
+    infos["politique"] = time.perf_counter() - debut - infos["preparation"] - infos["resolution"]
+    infos.update(nb_grilles = nb_grilles, nb_etats = int(actives.sum()), mises_a_jour = nb_maj, 
+                 iterations = iteration, statut = _statut(vs), total = time.perf_counter() - debut)
+    _enregistrer("pol_valeur_lot", infos)
+    if stats:
+        return pols, cpts, infos
+    return pols, cpts
+
+def _preparer_pd(grille, gamma, M, mode, elaguer = False):
+    """
+    Prépare les données communes aux algorithmes de programmation dynamique.
+    Si elaguer est True, seules les cases atteignables depuis la case 
+    initiale sont actives.
+
+    Returns
+    -------
+    vs : numpy.ndarray
+        Valeurs initiales des cases (nulles sauf la case but, qui vaut 
+        M/(1-gamma)), dans la numérotation de Grille.matrice_trans.
+    actives : numpy.ndarray
+        Masque des cases dont la valeur est mise à jour (ni murs, ni but, ni
+        cases élaguées).
+    trans : scipy.sparse.csr_matrix
+        Lignes de la matrice de transitions correspondant aux cases actives,
+        de taille (nb_actives * 4, nb_cases).
+    cout : numpy.ndarray
+        Coûts des cases actives d'après le mode.
+    """
+    vs = np.zeros(grille.tab.size)
+    vs[-1] = M / (1 - gamma)
+    actives = grille.tab.ravel() >= 0
+    if elaguer:
+        actives &= grille.accessibilite()[0].ravel()
+    actives[-1] = False
+    trans = grille.matrice_trans()[np.repeat(actives, 4)]
+    cout = grille.vecteur_cout(mode)[actives]
+    return vs, actives, trans, cout
+
+def _pol_gloutonne(grille, vs, actives, trans):
+    """
+    Retourne la stratégie pure gloutonne par rapport aux valeurs vs, sous la
+    forme d'un tableau 2D (0 sur les murs et 1 sur la case but).
+    """
+    pol = np.zeros(grille.tab.size, dtype = int)
+    pol[actives] = (trans @ vs).reshape(-1, 4).argmax(1)
+    pol = pol.reshape(grille.tab.shape)
     pol[-1, -1] = 1
-    for i in range(vs.shape[0]):
-        for j in range(vs.shape[1]):
-            if grille.tab[i, j] >= 0 and (i, j) != (vs.shape[0] - 1, vs.shape[1] - 1):
-                qat = - np.inf
-                for a in range(4):
-                    cases_p = grille.proba_trans(i, j, a)
-                    q = sum([p * vs[c] for c, p in cases_p.items()])
-                    if q > qat:
-                        qat = q
-                        pol[i, j] = a
+    return pol
+
+def _trans_politique(trans, pol_actives):
+    """
+    Retourne les lignes de trans correspondant aux actions choisies par une 
+    stratégie pure sur les cases actives.
+    """
+    return trans[np.arange(pol_actives.size) * 4 + pol_actives]
+
+def pol_iteration(grille, gamma, M, eps = 1e-5, mode = "couleur", elaguer = False, rappel = None, stats = False):
+    """
+    Calcule la stratégie optimale pour une grille donnée avec un gamma et une 
+    récompense finale passées en argument, en utilisant l'algorithme 
+    d'itération de la politique. Chaque stratégie est évaluée exactement par 
+    la résolution d'un système linéaire creux.
+
+    Parameters
+    ----------
+    grille : Grille
+        La Grille pour laquelle on calcule la stratégie optimale.
+    gamma : float
+        Le gamma (taux d'amortissement) utilisé dans le calcul.
+    M : int
+        La récompense de la case but.
+    eps : float
+        Une action ne remplace l'action courante d'une case que si elle
+        l'améliore de plus de eps, ce qui évite de boucler entre des actions
+        équivalentes. Le défaut est 1e-5.
+    mode : String
+        Avec quel coût calculer la stratégie. Deux modes: 'couleur' et 
+        'somme_chiffre'. Le défaut est 'couleur'.
+    elaguer : bool
+        Si True, la stratégie n'est calculée que sur les cases atteignables 
+        depuis la case initiale (voir Grille.accessibilite), dont les valeurs
+        ne dépendent pas des autres cases. Les autres cases reçoivent l'action
+        0. Le défaut est False.
+    rappel : Function
+        Si donnée, appelée après chaque évaluation de stratégie par 
+        rappel(iteration, residu, temps), où residu est la plus grande 
+        amélioration de la valeur d'une case par le changement de son action
+        (voir pol_valeur). Le défaut est None.
+    stats : bool
+        Si True, retourne aussi les statistiques du calcul (voir 
+        pol_valeur). Le défaut est False.
+
+    Returns
+    -------
+    pol : numpy.ndarray
+        Tableau 2D représentant une stratégie pure. 
+    cpt : int
+        La quantité d’itérations (évaluations de stratégie) avant la 
+        convergence de l'algorithme.
+    stats : dict
+        Seulement si stats est True. Les statistiques de pol_valeur, sans 
+        'mises_a_jour'.
+    """
+    from scipy.sparse.linalg import spsolve
+    debut = time.perf_counter()
+    infos = {"residu": None}
+    suivre = _suivi(infos, rappel, debut)
+    vs, actives, trans, cout = _preparer_pd(grille, gamma, M, mode, elaguer)
+    # Partie du système qui ne dépend pas des cases actives (case but)
+    trans_fixes = trans[:, ~actives] @ vs[~actives]
+    identite = sp.identity(actives.sum(), format = "csr")
+    infos["preparation"] = time.perf_counter() - debut
+    
+    pol_act = (trans @ vs).reshape(-1, 4).argmax(1)
+    stable = False
+    cpt = 0
+    while not stable:
+        # Évaluation exacte : (I - gamma P) v = - c + gamma P_fixes v_fixes
+        lignes = np.arange(pol_act.size) * 4 + pol_act
+        p_pol = _trans_politique(trans, pol_act)
+        vs[actives] = spsolve((identite - gamma * p_pol[:, actives]).tocsc(),
+                              - cout + gamma * trans_fixes[lignes])
+        cpt += 1
+        # Amélioration
+        q = (trans @ vs).reshape(-1, 4)
+        new_pol = q.argmax(1)
+        q_act = q[np.arange(pol_act.size), pol_act]
+        garder = q_act >= q.max(1) - eps
+        new_pol[garder] = pol_act[garder]
+        stable = np.array_equal(new_pol, pol_act)
+        pol_act = new_pol
+        suivre(cpt, (q.max(1) - q_act).max(initial = 0))
+    
+    infos["resolution"] = time.perf_counter() - debut - infos["preparation"]
+    pol = np.zeros(grille.tab.size, dtype = int)
+    pol[actives] = pol_act
+    pol = pol.reshape(grille.tab.shape)
+    pol[-1, -1] = 1
+    infos["politique"] = time.perf_counter() - debut - infos["preparation"] - infos["resolution"]
+    infos.update(nb_etats = int(actives.sum()), iterations = cpt, statut = _statut(vs), 
+                 total = time.perf_counter() - debut)
+    _enregistrer("pol_iteration", infos)
+    if stats:
+        return pol, cpt, infos
+    return pol, cpt
+
+def pol_iteration_modifiee(grille, gamma, M, eps = 1e-5, mode = "couleur", k = 10, elaguer = False, rappel = None, 
+                           stats = False):
+    """
+    Calcule la stratégie optimale pour une grille donnée avec un gamma et une 
+    récompense finale passées en argument, en utilisant l'algorithme 
+    d'itération de la politique modifiée : entre deux améliorations, la
+    stratégie courante n'est évaluée que partiellement avec k itérations.
+
+    Parameters
+    ----------
+    grille : Grille
+        La Grille pour laquelle on calcule la stratégie optimale.
+    gamma : float
+        Le gamma (taux d'amortissement) utilisé dans le calcul.
+    M : int
+        La récompense de la case but.
+    eps : float
+        Le critère d'arrêt utilisé dans le calcul, appliqué à la variation 
+        des valeurs lors de l'étape d'amélioration. Le défaut est 1e-5.
+    mode : String
+        Avec quel coût calculer la stratégie. Deux modes: 'couleur' et 
+        'somme_chiffre'. Le défaut est 'couleur'.
+    k : int
+        Nombre d'itérations d'évaluation partielle entre deux améliorations.
+        Avec k = 0, on retrouve l'itération de la valeur. Le défaut est 10.
+    elaguer : bool
+        Si True, la stratégie n'est calculée que sur les cases atteignables 
+        depuis la case initiale (voir Grille.accessibilite), dont les valeurs
+        ne dépendent pas des autres cases. Les autres cases reçoivent l'action
+        0. Le défaut est False.
+    rappel : Function
+        Si donnée, appelée après chaque amélioration par 
+        rappel(iteration, residu, temps), où residu est le changement des 
+        valeurs comparé à eps (voir pol_valeur). Le défaut est None.
+    stats : bool
+        Si True, retourne aussi les statistiques du calcul (voir 
+        pol_valeur). Le défaut est False.
+
+    Returns
+    -------
+    pol : numpy.ndarray
+        Tableau 2D représentant une stratégie pure. 
+    cpt : int
+        La quantité d’itérations (améliorations de stratégie) avant la 
+        convergence de l'algorithme.
+    stats : dict
+        Seulement si stats est True. Les mêmes statistiques que pol_valeur,
+        où 'mises_a_jour' compte aussi les k mises à jour de l'évaluation 
+        partielle.
+    """
+    debut = time.perf_counter()
+    infos = {"residu": None}
+    suivre = _suivi(infos, rappel, debut)
+    vs, actives, trans, cout = _preparer_pd(grille, gamma, M, mode, elaguer)
+    infos["preparation"] = time.perf_counter() - debut
+    erreur = 1 + eps
+    cpt = 0
+    while erreur > eps:
+        # Amélioration, qui fait aussi une première mise à jour des valeurs
+        q = (trans @ vs).reshape(-1, 4)
+        new_vs = - cout + gamma * q.max(1)
+        erreur = np.abs(vs[actives] - new_vs).max(initial = 0)
+        vs[actives] = new_vs
+        cpt += 1
+        # Évaluation partielle de la stratégie gloutonne
+        p_pol = _trans_politique(trans, q.argmax(1))
+        for _ in range(k):
+            vs[actives] = - cout + gamma * (p_pol @ vs)
+        suivre(cpt, erreur)
+    
+    infos["resolution"] = time.perf_counter() - debut - infos["preparation"]
+    pol = _pol_gloutonne(grille, vs, actives, trans)
+    infos["politique"] = time.perf_counter() - debut - infos["preparation"] - infos["resolution"]
+    nb_etats = int(actives.sum())
+    infos.update(nb_etats = nb_etats, mises_a_jour = cpt * (k + 1) * nb_etats, iterations = cpt, 
+                 statut = _statut(vs), total = time.perf_counter() - debut)
+    _enregistrer("pol_iteration_modifiee", infos)
+    if stats:
+        return pol, cpt, infos
     return pol, cpt
 
+def _predecesseurs(trans):
+    """
+    Retourne la matrice creuse (au format CSC) de taille (nb_actives, 
+    nb_cases) dont l'élément (k, s) vaut max_a T(k, a, s), où k parcourt les
+    cases actives. Les prédécesseurs d'une case s sont donc les lignes non 
+    nulles de la colonne s.
+    """
+    pred = trans[0::4]
+    for a in range(1, 4):
+        pred = pred.maximum(trans[a::4])
+    return pred.tocsc()
 
-def pol_pl_mixte(grille, gamma, M, mode = "couleur", verbose = False):
+def _blocs_distance(trans, actives):
+    """
+    Découpe les cases actives (numérotées par leur rang parmi les cases 
+    actives) par distance croissante à la case but, calculée par un 
+    parcours en largeur à partir de la case but sur le graphe des 
+    transitions inversé. Les cases qui ne peuvent pas atteindre la case but
+    forment le dernier bloc.
+    """
+    from scipy.sparse.csgraph import shortest_path
+    etats = np.flatnonzero(actives)
+    pred = _predecesseurs(trans).tocoo()
+    # Arc de chaque case vers ses prédécesseurs
+    graphe = sp.csr_matrix((np.ones(pred.nnz), (pred.col, etats[pred.row])), shape = (actives.size,) * 2)
+    distance = shortest_path(graphe, indices = actives.size - 1, unweighted = True)[etats]
+    distance[np.isinf(distance)] = actives.size
+    ordre = np.argsort(distance, kind = "stable")
+    return np.split(ordre, np.flatnonzero(np.diff(distance[ordre])) + 1)
+
+def _balayage_prioritaire(vs, actives, trans, cout, gamma, eps, rappel = None):
+    """
+    Itération de la valeur par une approximation par tours du balayage 
+    prioritaire. La priorité d'une case est un majorant de son résidu de 
+    Bellman : quand la valeur d'une case change de delta, la priorité de 
+    chacun de ses prédécesseurs augmente de gamma * max_a T(k, a, s) * delta.
+    Il n'y a pas de file de priorité qui met à jour une seule case à la 
+    fois, dans l'ordre exact des priorités (comme 
+    SolveurIncremental._propager) : à chaque tour, on met à jour en même 
+    temps toutes les cases dont la priorité dépasse un seuil, eps et le 
+    quart de la plus grande priorité, puis on propage leurs changements 
+    par un produit avec la matrice des prédécesseurs. À la fin, tous les 
+    résidus sont inférieurs à eps. Modifie vs en place et retourne le 
+    nombre de mises à jour de cases. Si rappel est donné, il est appelé par
+    rappel(tour, priorite) après chaque tour, avec la plus grande priorité 
+    restante.
+    """
+    etats = np.flatnonzero(actives)
+    pred = _predecesseurs(trans).tocsr()[:, etats]
+    # Les priorités initiales sont les résidus exacts
+    q = trans @ vs
+    priorite = np.abs(- cout + gamma * q.reshape(-1, 4).max(1, initial = - np.inf) - vs[etats])
+    delta = np.zeros(etats.size)
+    nb_maj = 0
+    tour = 0
+    # Une priorité infinie arrête aussi la boucle : aucune case ne dépasse 
+    # le quart d'une priorité infinie
+    while eps < priorite.max(initial = 0) < np.inf:
+        choisies = np.flatnonzero(priorite > max(eps, priorite.max() / 4))
+        q = trans[(choisies[:, None] * 4 + np.arange(4)).ravel()] @ vs
+        new_vs = - cout[choisies] + gamma * q.reshape(-1, 4).max(1)
+        delta[:] = 0
+        delta[choisies] = np.abs(new_vs - vs[etats[choisies]])
+        vs[etats[choisies]] = new_vs
+        priorite[choisies] = 0
+        priorite += gamma * (pred @ delta)
+        nb_maj += choisies.size
+        tour += 1
+        if rappel is not None:
+            rappel(tour, priorite.max(initial = 0))
+    return nb_maj
+
+class SolveurIncremental():
+    """
+    Itération de la valeur incrémentale, pour une grille qui change quelques
+    cases à la fois. Le premier calcul est fait comme pol_valeur (méthode 
+    'jacobi') ; ensuite, les modifications de la grille passent par 
+    modifier, qui ne recalcule que les lignes touchées de la matrice de 
+    transitions (voir Grille.modifier), et le calcul suivant repart des 
+    valeurs précédentes par un balayage prioritaire qui commence par les 
+    cases modifiées et ne se propage qu'aux cases dont la valeur change de 
+    plus de eps. Le coût d'un nouveau calcul dépend donc de l'effet de la 
+    modification et pas de la taille de la grille.
+    Si tab ou chiffre ont été modifiés sans passer par modifier (ou si p ou 
+    tab_cost ont changé), le calcul suivant repart de zéro.
+    
+    Parameters
+    ----------
+    grille : Grille
+        La Grille pour laquelle on calcule la stratégie optimale.
+    gamma : float
+        Le gamma (taux d'amortissement) utilisé dans le calcul.
+    M : int
+        La récompense de la case but.
+    eps : float
+        Le critère d'arrêt utilisé dans le calcul. Le défaut est 1e-5.
+    mode : String
+        Avec quel coût calculer la stratégie, 'couleur' ou 'somme_chiffre' 
+        (voir pol_valeur). Le défaut est 'couleur'.
+        
+    Attributes
+    ----------
+    grille : Grille
+        La grille.
+    nb_maj : int
+        Nombre de mises à jour de cases faites par le dernier calcul.
+    """
+    
+    def __init__(self, grille, gamma, M, eps = 1e-5, mode = "couleur"):
+        self.grille = grille
+        self.gamma = gamma
+        self.M = M
+        self.eps = eps
+        self.mode = mode
+        self.nb_maj = 0
+        self._v = None
+        self._cle = None
+        self._a_revoir = set()
+        
+    @property
+    def valeurs(self):
+        """
+        Valeurs des cases (tableau 2D) après le dernier calcul, ou None.
+        """
+        if self._v is None:
+            return None
+        return np.array(self._v).reshape(self.grille.tab.shape)
+        
+    def modifier(self, cases, couleurs = None, chiffres = None):
+        """
+        Modifie des cases de la grille (voir Grille.modifier) et retient les
+        cases à revoir au prochain calcul.
+
+        Returns
+        -------
+        numpy.ndarray
+            Les numéros des cases dont les transitions ou le coût ont changé.
+        """
+        etats = self.grille.modifier(cases, couleurs, chiffres)
+        if self._v is not None:
+            self._a_revoir.update(etats.tolist())
+            tab = self.grille.tab.ravel()
+            for s in etats.tolist():
+                # Les nouveaux murs ont une valeur nulle
+                if tab[s] < 0 and s != tab.size - 1:
+                    self._v[s] = 0.
+            for i, j in np.asarray(cases, dtype = int).reshape(-1, 2):
+                self._cle[0][i, j] = self.grille.tab[i, j]
+                self._cle[1][i, j] = self.grille.chiffre[i, j]
+        return etats
+    
+    def resoudre(self):
+        """
+        Calcule la stratégie optimale, en repartant des valeurs du calcul 
+        précédent si possible.
+
+        Returns
+        -------
+        pol : numpy.ndarray
+            Tableau 2D représentant une stratégie pure.
+        cpt : int
+            Le nombre d'itérations pour le premier calcul, puis le nombre de
+            mises à jour de cases pour les calculs incrémentaux.
+        """
+        debut = time.perf_counter()
+        grille = self.grille
+        cle = (grille.tab, grille.chiffre, grille.p, tuple(grille.tab_cost))
+        incremental = not (self._v is None or self._cle[2:] != cle[2:] 
+            or not np.array_equal(self._cle[0], grille.tab) or not np.array_equal(self._cle[1], grille.chiffre))
+        if not incremental:
+            vs, actives, trans, cout = _preparer_pd(grille, self.gamma, self.M, self.mode)
+            cpt = _iterer_jacobi(vs, actives, trans, cout, self.gamma, self.eps)
+            self.nb_maj = cpt * int(actives.sum())
+            self._v = vs.tolist()
+            self._cle = (grille.tab.copy(), grille.chiffre.copy()) + cle[2:]
+        else:
+            cpt = self.nb_maj = self._propager()
+            vs = np.array(self._v)
+            actives = grille.tab.ravel() >= 0
+            actives[-1] = False
+            trans = grille.matrice_trans()[np.repeat(actives, 4)]
+        self._a_revoir = set()
+        pol = _pol_gloutonne(grille, vs, actives, trans)
+        _enregistrer("SolveurIncremental.resoudre", {"incremental": incremental, "mises_a_jour": self.nb_maj, 
+                                                     "nb_etats": int(actives.sum()), "statut": _statut(vs), 
+                                                     "total": time.perf_counter() - debut})
+        return pol, cpt
+    
+    def _propager(self):
+        """
+        Balayage prioritaire (voir _balayage_prioritaire) à partir des cases
+        à revoir. Les successeurs et les prédécesseurs sont calculés à la 
+        demande, les prédécesseurs d'une case étant dans son voisinage 3x3.
+        Retourne le nombre de mises à jour.
+        """
+        grille, gamma, eps, v = self.grille, self.gamma, self.eps, self._v
+        lig, col = grille.tab.shape
+        trans = grille.matrice_trans()
+        indptr, indices, data = trans.indptr, trans.indices, trans.data
+        cout = grille.vecteur_cout(self.mode)
+        tab = grille.tab.ravel()
+        but = tab.size - 1
+        succ = {}
+        
+        def successeurs(s):
+            if s not in succ:
+                succ[s] = [(indices[indptr[r]:indptr[r + 1]].tolist(), data[indptr[r]:indptr[r + 1]].tolist()) 
+                           for r in range(4 * s, 4 * s + 4)]
+            return succ[s]
+        
+        def backup(s):
+            return - cout[s] + gamma * max(sum(p * v[c] for c, p in zip(cases, probas)) 
+                                           for cases, probas in successeurs(s))
+        
+        def predecesseurs(s):
+            i, j = divmod(s, col)
+            for k in (i2 * col + j2 for i2 in range(max(i - 1, 0), min(i + 2, lig)) 
+                      for j2 in range(max(j - 1, 0), min(j + 2, col))):
+                if tab[k] >= 0 and k != but:
+                    t = max((p for cases, probas in successeurs(k) for c, p in zip(cases, probas) if c == s), 
+                            default = 0)
+                    if t > 0:
+                        yield k, t
+        
+        priorite = defaultdict(float)
+        tas = []
+        for s in self._a_revoir:
+            if tab[s] >= 0 and s != but:
+                priorite[s] = abs(backup(s) - v[s])
+                if priorite[s] > eps:
+                    tas.append((- priorite[s], s))
+        heapq.heapify(tas)
+        nb_maj = 0
+        while tas:
+            r, s = heapq.heappop(tas)
+            if - r != priorite[s]:
+                continue
+            priorite[s] = 0
+            new_v = backup(s)
+            delta = abs(new_v - v[s])
+            v[s] = new_v
+            nb_maj += 1
+            for k, t in predecesseurs(s):
+                priorite[k] += gamma * t * delta
+                if priorite[k] > eps:
+                    heapq.heappush(tas, (- priorite[k], k))
+        return nb_maj
+
+def _contraintes_pl(grille, gamma, elaguer = False):
+    """
+    Construit les contraintes de conservation du flot des PL, sous forme 
+    matricielle A x = b. Les variables x(s, a) sont numérotées k * 4 + a, où
+    k est le numéro de la case s parmi les cases gardées dans le PL : les 
+    cases qui ne sont pas des murs et, si elaguer est True, qui sont 
+    atteignables depuis la case initiale.
+
+    Returns
+    -------
+    exclues : numpy.ndarray
+        Masque des cases exclues du PL dans la numérotation de 
+        Grille.matrice_trans.
+    A : scipy.sparse.csr_matrix
+        Matrice des contraintes, de taille (nb_cases_gardees, 
+        nb_cases_gardees * 4), qui vaut sum_a x(s’, a) - gamma * 
+        sum_(s, a) T(s, a, s’) x(s, a) sur la ligne de la case s’.
+    b : numpy.ndarray
+        Second membre des contraintes.
+    """
+    exclues = grille.tab.ravel() < 0
+    if elaguer:
+        exclues |= ~grille.accessibilite()[0].ravel()
+    nb = (~exclues).sum()
+    trans = grille.matrice_trans()[np.repeat(~exclues, 4)][:, ~exclues]
+    somme = sp.kron(sp.identity(nb, format = "csr"), np.ones((1, 4)), format = "csr")
+    A = (somme - gamma * trans.T).tocsr()
+    b = np.full(nb, 1 / nb)
+    return exclues, A, b
+
+def _recompenses_pl(grille, exclues, mode, recompense_but):
+    """
+    Retourne le vecteur des coefficients de la fonction objectif des PL 
+    (moins le coût de la case, ou recompense_but pour la case but), dans la 
+    numérotation des variables de _contraintes_pl.
+    """
+    reward = - grille.vecteur_cout(mode)[~exclues]
+    if not exclues[-1]:
+        reward[-1] = recompense_but
+    return np.repeat(reward, 4)
+
+def _recompenses_couleurs(grille, exclues, M):
+    """
+    Retourne la matrice de taille (nb_couleurs, nb_variables) dont la ligne c
+    contient les coefficients de l'objectif selon le critère de la couleur c 
+    (moins le poids des cases de couleur c, M pour la case but).
+    """
+    rewards_c = - grille.vecteur_cout("chiffre")[~exclues].T
+    if not exclues[-1]:
+        rewards_c[:, -1] = M
+    return np.repeat(rewards_c, 4, axis = 1)
+
+def _strat_mixte(grille, exclues, solution):
+    """
+    Construit la stratégie mixte (tableau 3D) à partir des valeurs des 
+    variables x(s, a) d'un PL.
+    """
+    lig, col = grille.tab.shape
+    strat = np.ones((lig * col, 4))
+    strat[~exclues] = solution.reshape(-1, 4)
+    strat = strat.reshape(lig, col, 4)
+    # Normalisation pour trouver les probabilités
+    return strat / strat.sum(2).reshape((lig, col, 1))
+
+def _choisir_solveur(solveur):
+    """
+    Retourne le solveur à utiliser pour les PL : avec 'auto', Gurobi s'il est
+    installé, sinon HiGHS par l'intermédiaire de scipy.
+    """
+    assert solveur in ["auto", "gurobi", "scipy"], "Solveur inconnu : " + str(solveur)
+    if solveur == "auto":
+        return "scipy" if _gurobipy() is None else "gurobi"
+    if solveur == "gurobi" and _gurobipy() is None:
+        raise ImportError("Le solveur 'gurobi' demande le module gurobipy")
+    return solveur
+
+def _resoudre_pl(nom, c, A_eq, b_eq, A_ub = None, b_ub = None, lb = 0, ub = np.inf, entiers = None, 
+                 solveur = "auto", verbose = False):
+    """
+    Résout le PL (ou PLNE si entiers est donné) 
+        max c x  s.c.  A_eq x = b_eq,  A_ub x <= b_ub,  lb <= x <= ub
+    avec Gurobi ou avec HiGHS (scipy.optimize.linprog et milp). Les matrices
+    des contraintes sont creuses et passées en une seule fois au solveur.
+
+    Parameters
+    ----------
+    nom : String
+        Nom du modèle.
+    c : numpy.ndarray
+        Coefficients de la fonction objectif.
+    A_eq, b_eq : scipy.sparse.csr_matrix, numpy.ndarray
+        Contraintes d'égalité.
+    A_ub, b_ub : scipy.sparse.csr_matrix, numpy.ndarray
+        Contraintes d'inégalité. Le défaut est None (pas de contrainte).
+    lb, ub : float ou numpy.ndarray
+        Bornes des variables. Les défauts sont 0 et l'infini.
+    entiers : numpy.ndarray
+        Masque des variables entières. Le défaut est None (PL).
+    solveur : String
+        'gurobi', 'scipy' ou 'auto' (voir _choisir_solveur). Le défaut est 
+        'auto'.
+    verbose : bool
+        Si True, affiche la résolution. Le défaut est False.
+
+    Returns
+    -------
+    x : numpy.ndarray
+        La solution optimale, ou None si le solveur n'en a pas trouvé.
+    obj_val : float
+        La valeur de la fonction objectif à l'optimum, ou None.
+    infos : dict
+        Temps (en secondes) de construction ('construction') et de 
+        résolution ('resolution') du modèle dans le solveur, 'solveur', 
+        'statut' ('optimal' ou le statut du solveur), nombre d'itérations du
+        simplexe ou de l'algorithme intérieur ('iterations'), nombre de 
+        nœuds et écart relatif final pour un PLNE ('noeuds', 'ecart_mip', 
+        None pour un PL) et taille du modèle ('nb_variables', 
+        'nb_contraintes', 'nb_non_zeros').
+    """
+    debut = time.perf_counter()
+    lb = np.broadcast_to(np.asarray(lb, dtype = float), c.shape)
+    ub = np.broadcast_to(np.asarray(ub, dtype = float), c.shape)
+    x = None
+    obj_val = None
+    
+    if _choisir_solveur(solveur) == "gurobi":
+        gp = _gurobipy()
+        pl, xs = _modele_gurobi(nom, c, A_eq, b_eq, A_ub, b_ub, lb, ub, entiers, verbose)
+        construction = time.perf_counter() - debut
+        pl.optimize()
+        if pl.status == gp.GRB.OPTIMAL:
+            x = xs.X
+            obj_val = pl.objVal
+        infos = _infos_gurobi(pl, gp, entiers is not None)
+    else:
+        from scipy.optimize import Bounds, LinearConstraint, linprog, milp
+        construction = time.perf_counter() - debut
+        if entiers is None:
+            res = linprog(- c, A_ub = A_ub, b_ub = b_ub, A_eq = A_eq, b_eq = b_eq, 
+                          bounds = np.column_stack([lb, ub]), method = "highs", options = {"disp": verbose})
+        else:
+            contraintes = [LinearConstraint(A_eq, b_eq, b_eq)]
+            if A_ub is not None:
+                contraintes.append(LinearConstraint(A_ub, - np.inf, b_ub))
+            res = milp(- c, constraints = contraintes, integrality = entiers.astype(int), 
+                       bounds = Bounds(lb, ub), options = {"disp": verbose})
+        if res.status == 0:
+            x = res.x
+            obj_val = - res.fun
+        nb_ub = 0 if A_ub is None else A_ub.shape[0]
+        infos = {"solveur": "scipy", "statut": "optimal" if res.status == 0 else res.message, 
+                 "iterations": getattr(res, "nit", None), 
+                 "noeuds": None if entiers is None else getattr(res, "mip_node_count", None), 
+                 "ecart_mip": None if entiers is None else getattr(res, "mip_gap", None), "nb_variables": c.size, 
+                 "nb_contraintes": A_eq.shape[0] + nb_ub, 
+                 "nb_non_zeros": A_eq.nnz + (0 if A_ub is None else A_ub.nnz)}
+    infos.update(construction = construction, resolution = time.perf_counter() - debut - construction)
+    return x, obj_val, infos
+
+def _modele_gurobi(nom, c, A_eq, b_eq, A_ub = None, b_ub = None, lb = 0, ub = np.inf, entiers = None, 
+                   verbose = False):
+    """
+    Construit le modèle Gurobi du PL de _resoudre_pl et retourne le modèle et
+    le MVar de ses variables.
+    """
+    gp = _gurobipy()
+    pl = gp.Model(nom)
+    if not verbose:
+        pl.setParam("OutputFlag", 0)
+    vtype = gp.GRB.CONTINUOUS if entiers is None else np.where(entiers, gp.GRB.INTEGER, gp.GRB.CONTINUOUS)
+    xs = pl.addMVar(c.size, lb = lb, ub = ub, vtype = vtype, name = "x")
+    pl.setObjective(c @ xs, gp.GRB.MAXIMIZE)
+    pl.addMConstr(A_eq, xs, "=", b_eq, name = "contr_eq")
+    if A_ub is not None:
+        pl.addMConstr(A_ub, xs, "<", b_ub, name = "contr_ub")
+    pl.update()
+    return pl, xs
+
+def _infos_gurobi(pl, gp, entiers):
+    """
+    Retourne les informations de la dernière résolution d'un modèle Gurobi
+    (voir _resoudre_pl).
+    """
+    optimal = pl.status == gp.GRB.OPTIMAL
+    return {"solveur": "gurobi", "statut": "optimal" if optimal else "statut " + str(pl.status), 
+            "iterations": int(pl.IterCount), "noeuds": int(pl.NodeCount) if entiers else None, 
+            "ecart_mip": pl.MIPGap if entiers and pl.SolCount > 0 else None, 
+            "nb_variables": pl.NumVars, "nb_contraintes": pl.NumConstrs, "nb_non_zeros": pl.NumNZs}
+
+def _ajouter_temps(temps_pl, debut):
+    """
+    Ajoute aux informations retournées par _resoudre_pl le temps de 
+    construction des matrices du PL depuis debut, et le temps total.
+    """
+    total = time.perf_counter() - debut
+    return dict(temps_pl, construction = total - temps_pl["resolution"], total = total)
+
+def pol_pl_mixte(grille, gamma, M, mode = "couleur", verbose = False, temps = False, solveur = "auto", elaguer = False):
     """    
     Calcule la stratégie optimale pour une grille donnée, avec un gamma et une 
     récompense finale passées en argument, en utilisant un PL. Le mode indique 
@@ -721,8 +2962,18 @@ def pol_pl_mixte(grille, gamma, M, mode = "couleur", verbose = False):
         'somme_chiffre' calcule la stratégie avec la somme des coûts en chiffre 
         (partie 4a de l'enoncé). Le défaut est 'couleur'.
     verbose : bool
-        If True, shows the resolution of the PL calculated by Gurobi. Le défaut
-        est False.        
+        If True, shows the resolution of the PL calculated by the solver. Le 
+        défaut est False.        
+    temps : bool
+        Si True, retourne aussi les temps de construction et de résolution du
+        PL. Le défaut est False.
+    solveur : String
+        Le solveur utilisé : 'gurobi', 'scipy' (HiGHS) ou 'auto' (Gurobi s'il
+        est installé, sinon HiGHS). Le défaut est 'auto'.
+    elaguer : bool
+        Si True, le PL ne contient que les cases atteignables depuis la case 
+        initiale (voir Grille.accessibilite). La distribution initiale est
+        alors uniforme sur ces cases seulement. Le défaut est False.
 
     Returns
     -------
@@ -732,70 +2983,39 @@ def pol_pl_mixte(grille, gamma, M, mode = "couleur", verbose = False):
         Valeur de la fonction objectif à l'optimum dans le cas du mode
         'couleur', ou liste avec les valeurs selon chaque critère dans le
         mode 'somme_chiffre'.
+    temps : dict
+        Seulement si temps est True. Temps (en secondes) de construction 
+        ('construction'), de résolution ('resolution') et total ('total') du 
+        PL, ainsi que le statut du solveur, le nombre d'itérations et la 
+        taille du PL (voir _resoudre_pl). Ces informations sont aussi 
+        gardées par les Profilage actifs.
     """
-
-    # On créé le pl
-    pl = gp.Model("mixte")
-    if not verbose:
-        pl.setParam("OutputFlag", 0)
-    lig, col = grille.tab.shape
-    
-    # On créé les variables et coefficients de la fonction objectif
-    var, reward = gp.multidict({(i, j, a): - grille.case_cout(i, j, mode)  
-                                for i in range(lig) 
-                                for j in range(col) 
-                                for a in range(4) 
-                                if grille.tab[i, j] >= 0})
+    debut = time.perf_counter()
+    # On créé les contraintes et les coefficients de la fonction objectif
+    exclues, A, b = _contraintes_pl(grille, gamma, elaguer)
+    if mode == "couleur":
+        reward = _recompenses_pl(grille, exclues, mode, M)
+    else:
+        reward = _recompenses_pl(grille, exclues, mode, M * len(grille.tab_cost))
     
-    # On reajuste le coefficient de la case but 
-    for a in range(4):
-        if mode == "couleur":
-            reward[(lig - 1, col - 1, a)] = M
-        else:
-            reward[(lig - 1, col - 1, a)] = M * len(grille.tab_cost)
-            
-    # On ajoute les variables et la fonction objectif
-    xsa = pl.addVars(var, name = "x")
-    pl.setObjective(xsa.prod(reward), gp.GRB.MAXIMIZE)
-    
-    # On ajoute les contraintes
-    pl.addConstrs((xsa.sum(i, j, "*") - gamma * 
-                   xsa.prod(grille.proba_trans_arr(i, j)) == 4 / len(var) 
-                  for i in range(lig) 
-                  for j in range(col)  
-                  if grille.tab[i, j] >= 0), "contr")
     # L'optimisation
-    pl.optimize()
+    solution, obj_val, temps_pl = _resoudre_pl("mixte", reward, A, b, solveur = solveur, verbose = verbose)
     # On créé les probabilités
     strat = None
-    obj_val = None
     # On teste si on a une vrai solution
-    if pl.status == gp.GRB.OPTIMAL:
-        # Recuperation des solutions
-        strat = np.ones((*grille.tab.shape, 4))
-        solution = pl.getAttr("x", xsa)
-        for key, val in solution.items():
-            strat[key] = val
-            
+    if solution is not None:
+        strat = _strat_mixte(grille, exclues, solution)
         # Dans le mode somme_chiffre, on retourne les objectifs à l'optimum
         # selon chacun des critères
         if mode == "somme_chiffre":
-            obj_val = []
-            for c in range(len(grille.tab_cost)):
-                # On ne garde que les rewards de la couleur c
-                reward_c = dict(filter(lambda item: grille.tab[item[0][0], item[0][1]] == c, reward.items()))
-                for a in range(4):
-                    reward_c[(lig - 1, col - 1, a)] = M
-                obj_val.append(solution.prod(reward_c).getValue())
-        # Sinon, on retourne simplement l'objectif
-        else:
-            obj_val = pl.objVal
-            
-        # Normalisation pour trouver les probabilités
-        strat = strat / strat.sum(2).reshape((lig, col, 1))  
+            obj_val = (_recompenses_couleurs(grille, exclues, M) @ solution).tolist()
+    infos = _ajouter_temps(temps_pl, debut)
+    _enregistrer("pol_pl_mixte", infos)
+    if temps:
+        return strat, obj_val, infos
     return strat, obj_val
 
-def pol_pl_pure(grille, gamma, M, mode = "couleur", verbose = False):
+def pol_pl_pure(grille, gamma, M, mode = "couleur", verbose = False, temps = False, solveur = "auto", elaguer = False):
     """    
     Calcule la stratégie optimale pour une grille donnée, avec un gamma et une 
     récompense finale passées en argument, en utilisant un PLNE. Le mode 
@@ -818,8 +3038,18 @@ def pol_pl_pure(grille, gamma, M, mode = "couleur", verbose = False):
         'somme_chiffre' calcule la stratégie avec la somme des coûts en chiffre 
         (partie 4a de l'enoncé). Le défaut est 'couleur'.
     verbose : bool
-        If True, shows the resolution of the PLNE calculated by Gurobi. Le 
+        If True, shows the resolution of the PLNE calculated by the solver. Le 
         défaut est False.        
+    temps : bool
+        Si True, retourne aussi les temps de construction et de résolution du
+        PLNE. Le défaut est False.
+    solveur : String
+        Le solveur utilisé : 'gurobi', 'scipy' (HiGHS) ou 'auto' (Gurobi s'il
+        est installé, sinon HiGHS). Le défaut est 'auto'.
+    elaguer : bool
+        Si True, le PL ne contient que les cases atteignables depuis la case 
+        initiale (voir Grille.accessibilite). La distribution initiale est
+        alors uniforme sur ces cases seulement. Le défaut est False.
 
     Returns
     -------
@@ -827,61 +3057,48 @@ def pol_pl_pure(grille, gamma, M, mode = "couleur", verbose = False):
         Tableau 2D représentant une stratégie pure. 
     obj_val : float
         Valeur de la fonction objectif à l'optimum.
+    temps : dict
+        Seulement si temps est True. Temps (en secondes) de construction 
+        ('construction'), de résolution ('resolution') et total ('total') du 
+        PLNE, ainsi que le statut du solveur, le nombre d'itérations et de 
+        nœuds, l'écart final et la taille du PLNE (voir _resoudre_pl). Ces 
+        informations sont aussi gardées par les Profilage actifs.
     """
-    # On créé le pl
-    pl = gp.Model("mixte")
-    if not verbose:
-        pl.setParam("OutputFlag", 0)
-    lig, col = grille.tab.shape
+    debut = time.perf_counter()
+    # On créé les contraintes et les coefficients de la fonction objectif. 
+    # Les variables sont les x(s, a) suivies des d(s, a) binaires.
+    exclues, A, b = _contraintes_pl(grille, gamma, elaguer)
+    reward = _recompenses_pl(grille, exclues, mode, M)
+    nb_var = reward.size
+    identite = sp.identity(nb_var, format = "csr")
+    somme = sp.kron(sp.identity(nb_var // 4, format = "csr"), np.ones((1, 4)), format = "csr")
     
-    # On créé les variables et coefficients de la fonction objectif
-    var, reward = gp.multidict({(i, j, a): - grille.case_cout(i, j, mode)  
-                                for i in range(lig) 
-                                for j in range(col) 
-                                for a in range(4) 
-                                if grille.tab[i, j] >= 0})
-    
-    # On reajuste le coefficient de la case but 
-    for a in range(4):
-        reward[(lig - 1, col - 1, a)] = M
-        
-    # On ajoute les variables et la fonction objectif
-    xsa = pl.addVars(var, name = "x")
-    dsa = pl.addVars(var, name = "d", vtype = gp.GRB.BINARY)
-    
-    pl.setObjective(xsa.prod(reward), gp.GRB.MAXIMIZE)
-    
-    # On ajoute les contraintes
-    pl.addConstrs((xsa.sum(i, j, "*") - gamma * 
-                   xsa.prod(grille.proba_trans_arr(i, j)) == 4 / len(var) 
-                  for i in range(lig) 
-                  for j in range(col)  
-                  if grille.tab[i, j] >= 0), "contr_x")
-    pl.addConstrs((dsa.sum(i, j, "*") <= 1 
-                  for i in range(lig) 
-                  for j in range(col)  
-                  if grille.tab[i, j] >= 0), "contr_d")
-    pl.addConstrs(((1 - gamma) * xsa[i, j, a] <= dsa[i, j, a] 
-                  for i, j, a in var), "contr_xd")   
+    A_eq = sp.hstack([A, sp.csr_matrix((A.shape[0], nb_var))], format = "csr")
+    # sum_a d(s, a) <= 1 et (1 - gamma) x(s, a) <= d(s, a)
+    A_ub = sp.vstack([sp.hstack([sp.csr_matrix((nb_var // 4, nb_var)), somme]),
+                      sp.hstack([(1 - gamma) * identite, - identite])], format = "csr")
+    b_ub = np.concatenate([np.ones(nb_var // 4), np.zeros(nb_var)])
+    entiers = np.repeat([False, True], nb_var)
+    ub = np.where(entiers, 1, np.inf)
     
     # L'optimisation
-    pl.optimize()
-    # On créé les probabilités
+    solution, obj_val, temps_pl = _resoudre_pl("pure", np.concatenate([reward, np.zeros(nb_var)]), A_eq, b, 
+                                               A_ub, b_ub, ub = ub, entiers = entiers, 
+                                               solveur = solveur, verbose = verbose)
     strat = None
-    obj_val = None
     # On teste si on a une vrai solution
-    if pl.status == gp.GRB.OPTIMAL:
-        obj_val = pl.objVal
-        # Recuperation des solutions
-        strat = np.zeros(grille.tab.shape, dtype = int)
-        solution = pl.getAttr("x", dsa)
-        for (i, j, a), val in solution.items():
-            if val == 1:
-                strat[i, j] = a
+    if solution is not None:
+        strat = np.zeros(grille.tab.size, dtype = int)
+        strat[~exclues] = (solution[nb_var:].reshape(-1, 4) > 0.5).argmax(1)
+        strat = strat.reshape(grille.tab.shape)
+    infos = _ajouter_temps(temps_pl, debut)
+    _enregistrer("pol_pl_pure", infos)
+    if temps:
+        return strat, obj_val, infos
     return strat, obj_val
 
 
-def pol_pl_mixte_mo(grille, gamma, M, verbose = False):
+def pol_pl_mixte_mo(grille, gamma, M, verbose = False, temps = False, solveur = "auto", elaguer = False):
     """    
     Calcule la stratégie optimale pour une grille donnée, avec un gamma et une 
     récompense finale passées en argument, en utilisant un PL. Cette fonction 
@@ -898,8 +3115,18 @@ def pol_pl_mixte_mo(grille, gamma, M, verbose = False):
     M : int
         La récompense de la case but.
     verbose : bool
-        If True, shows the resolution of the PL calculated by Gurobi. Le défaut
-        est False.        
+        If True, shows the resolution of the PL calculated by the solver. Le 
+        défaut est False.        
+    temps : bool
+        Si True, retourne aussi les temps de construction et de résolution du
+        PL. Le défaut est False.
+    solveur : String
+        Le solveur utilisé : 'gurobi', 'scipy' (HiGHS) ou 'auto' (Gurobi s'il
+        est installé, sinon HiGHS). Le défaut est 'auto'.
+    elaguer : bool
+        Si True, le PL ne contient que les cases atteignables depuis la case 
+        initiale (voir Grille.accessibilite). La distribution initiale est
+        alors uniforme sur ces cases seulement. Le défaut est False.
 
     Returns
     -------
@@ -907,66 +3134,579 @@ def pol_pl_mixte_mo(grille, gamma, M, verbose = False):
         Tableau 3D représentant une stratégie mixte. 
     obj_val : list(float)
         Valeur à l'optimum de l'objectif selon chaque critère.
+    temps : dict
+        Seulement si temps est True. Temps (en secondes) de construction 
+        ('construction'), de résolution ('resolution') et total ('total') du 
+        PL, ainsi que le statut du solveur, le nombre d'itérations et la 
+        taille du PL (voir _resoudre_pl). Ces informations sont aussi 
+        gardées par les Profilage actifs.
     """
+    debut = time.perf_counter()
+    # On créé les contraintes liées aux xsa. Les variables sont les x(s, a) 
+    # suivies de z.
+    exclues, A, b = _contraintes_pl(grille, gamma, elaguer)
+    rewards_c = _recompenses_couleurs(grille, exclues, M)
+    nb_var = A.shape[1]
+    nb_coul = len(grille.tab_cost)
+    A_eq = sp.hstack([A, sp.csr_matrix((A.shape[0], 1))], format = "csr")
     
-    # On créé le pl
-    pl = gp.Model("mixte")
-    if not verbose:
-        pl.setParam("OutputFlag", 0)
-    lig, col = grille.tab.shape
-    
-    # On créé les variables et coefficients de la fonction objectif
-    var, reward = gp.multidict({(i, j, a): - grille.case_cout(i, j, "somme_chiffre")  
-                                for i in range(lig) 
-                                for j in range(col) 
-                                for a in range(4) 
-                                if grille.tab[i, j] >= 0})
-    
-    # On reajuste le coefficient de la case but 
-    for a in range(4):
-        reward[(lig - 1, col - 1, a)] = M
-        
-    # On ajoute les variables et la fonction objectif
-    xsa = pl.addVars(var, name = "x")
-    z = pl.addVar(lb = -float("inf"), name = "z")
-    
-    pl.setObjective(z, gp.GRB.MAXIMIZE)
-    
-    # On ajoute les contraintes liées aux xsa
-    pl.addConstrs((xsa.sum(i, j, "*") - gamma * 
-                   xsa.prod(grille.proba_trans_arr(i, j)) == 4 / len(var) 
-                  for i in range(lig) 
-                  for j in range(col)  
-                  if grille.tab[i, j] >= 0), "contr")
-    
-    # On ajoute les contraintes lieés à z
-    rewards_c = []
-    for c in range(len(grille.tab_cost)):
-        reward_c = dict(filter(lambda item: grille.tab[item[0][0], item[0][1]] == c, reward.items()))
-        for a in range(4):
-            reward_c[(lig - 1, col - 1, a)] = M
-        pl.addConstr(z <= xsa.prod(reward_c), "contr_color_" + str(c))
-        rewards_c.append(reward_c)
+    # On ajoute les contraintes lieés à z : z - reward_c . x <= 0
+    A_ub = sp.csr_matrix(np.hstack([- rewards_c, np.ones((nb_coul, 1))]))
+    c = np.zeros(nb_var + 1)
+    c[-1] = 1
+    lb = np.zeros(nb_var + 1)
+    lb[-1] = - np.inf
     
     # L'optimisation
-    pl.optimize()
-    # On créé les probabilités
+    solution, _, temps_pl = _resoudre_pl("mixte", c, A_eq, b, A_ub, np.zeros(nb_coul), lb = lb, 
+                                         solveur = solveur, verbose = verbose)
     strat = None
     obj_val = None
     # On teste si on a une vraie solution
-    if pl.status == gp.GRB.OPTIMAL:
-        obj_val = []
-        # Recuperation des solutions
-        strat = np.ones((*grille.tab.shape, 4))
-        solution = pl.getAttr("x", xsa)
-        for reward_c in rewards_c:
-            obj_val.append(solution.prod(reward_c).getValue())
-        for key, val in solution.items():
-            strat[key] = val
-        # Normalisation pour trouver les probabilités
-        strat = strat / strat.sum(2).reshape((lig, col, 1))  
+    if solution is not None:
+        solution = solution[:-1]
+        obj_val = (rewards_c @ solution).tolist()
+        strat = _strat_mixte(grille, exclues, solution)
+    infos = _ajouter_temps(temps_pl, debut)
+    _enregistrer("pol_pl_mixte_mo", infos)
+    if temps:
+        return strat, obj_val, infos
     return strat, obj_val
 
+def front_pareto(grille, gamma, M, nb_poids = 10, seed = None, solveur = "auto", nb_processus = 1, elaguer = False):
+    """
+    Calcule des points du front de Pareto des critères de chaque couleur 
+    (partie 4 de l'énoncé), en résolvant le PL de pol_pl_mixte pour 
+    plusieurs sommes pondérées des critères. Les contraintes du PL ne 
+    dépendent pas des poids : elles sont construites une seule fois. Les 
+    poids sont rangés pour que deux poids consécutifs soient proches (plus
+    proche voisin) et découpés en tranches consécutives, une par processus.
+    Avec Gurobi, chaque processus construit un seul modèle et, d'un poids au
+    suivant, ne change que les coefficients de l'objectif : chaque 
+    résolution repart de la base optimale du poids précédent (comme 
+    SolveurPL). Avec HiGHS (scipy), qui ne permet ni de garder un modèle ni
+    de donner une base de départ, chaque poids est un nouveau PL. Les points
+    dominés (et les doublons) sont ensuite retirés.
+
+    Parameters
+    ----------
+    grille : Grille
+        La Grille pour laquelle on calcule les stratégies.
+    gamma : float
+        Le gamma (taux d'amortissement) utilisé dans le calcul.
+    M : int
+        La récompense de la case but, selon chaque critère.
+    nb_poids : int ou numpy.ndarray
+        Nombre de vecteurs de poids, ou tableau de taille (nb, nb_couleurs) 
+        des poids eux-mêmes. Avec un nombre, les premiers poids sont ceux 
+        d'un seul critère (un par couleur), les autres sont tirés 
+        uniformément sur le simplexe. Le défaut est 10.
+    seed : None ou int
+        Graine du tirage des poids. Le défaut est None.
+    solveur : String
+        Le solveur utilisé : 'gurobi', 'scipy' (HiGHS) ou 'auto' (voir 
+        pol_pl_mixte). Le défaut est 'auto'.
+    nb_processus : int
+        Nombre de processus utilisés. Si None, le nombre de processeurs de la
+        machine. Avec 1, les PL sont résolus dans le processus courant. Le
+        défaut est 1.
+    elaguer : bool
+        Si True, le PL ne contient que les cases atteignables depuis la case 
+        initiale (voir pol_pl_mixte). Le défaut est False.
+
+    Returns
+    -------
+    valeurs : numpy.ndarray
+        Tableau de taille (nb_points, nb_couleurs) des valeurs des points non
+        dominés selon chaque critère (comme obj_val de pol_pl_mixte_mo).
+    strategies : list(numpy.ndarray)
+        Les stratégies mixtes (tableaux 3D) de chaque point.
+    poids : numpy.ndarray
+        Tableau de taille (nb_points, nb_couleurs) des poids avec lesquels 
+        chaque point a été obtenu.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+    debut = time.perf_counter()
+    nb_coul = len(grille.tab_cost)
+    if np.ndim(nb_poids) == 0:
+        rng = np.random.default_rng(seed)
+        poids = np.vstack([np.eye(nb_coul), rng.dirichlet(np.ones(nb_coul), max(nb_poids - nb_coul, 0))])[:nb_poids]
+    else:
+        poids = np.asarray(nb_poids, dtype = float)
+    
+    exclues, A, b = _contraintes_pl(grille, gamma, elaguer)
+    rewards_c = _recompenses_couleurs(grille, exclues, M)
+    probleme = (rewards_c, A, b, _choisir_solveur(solveur))
+    nb_processus = min(nb_processus or os.cpu_count(), max(len(poids), 1))
+    ordre = _ordre_voisins(poids)
+    tranches = [poids[k] for k in np.array_split(ordre, nb_processus)]
+    preparation = time.perf_counter() - debut
+    if nb_processus == 1:
+        _init_front(probleme)
+        resultats = [_resoudre_poids(tranche) for tranche in tranches]
+        _PROBLEME_FRONT.clear()
+    else:
+        with ProcessPoolExecutor(nb_processus, initializer = _init_front, initargs = (probleme,)) as executeur:
+            resultats = list(executeur.map(_resoudre_poids, tranches))
+    solutions = [None] * len(poids)
+    for k, solution in zip(ordre, (x for resultat in resultats for x in resultat)):
+        solutions[k] = solution
+    
+    trouvees = [k for k, x in enumerate(solutions) if x is not None]
+    valeurs = np.array([rewards_c @ solutions[k] for k in trouvees]).reshape(-1, nb_coul)
+    gardes = _non_domines(valeurs)
+    strategies = [_strat_mixte(grille, exclues, solutions[trouvees[k]]) for k in np.flatnonzero(gardes)]
+    _enregistrer("front_pareto", {"solveur": probleme[3], "nb_processus": nb_processus, "nb_poids": len(poids), 
+                                  "nb_echecs": len(poids) - len(trouvees), "nb_points": int(gardes.sum()), 
+                                  "preparation": preparation, "total": time.perf_counter() - debut})
+    return valeurs[gardes], strategies, poids[trouvees][gardes]
+
+_PROBLEME_FRONT = {}
+
+def _init_front(probleme):
+    """
+    Garde, dans un processus de calcul, les données du PL de front_pareto.
+    """
+    _PROBLEME_FRONT.clear()
+    _PROBLEME_FRONT["probleme"] = probleme
+
+def _resoudre_poids(liste_poids):
+    """
+    Résout le PL de front_pareto pour des vecteurs de poids, dans l'ordre, et
+    retourne la liste des valeurs des variables x(s, a) (None s'il n'y a pas
+    de solution). Avec Gurobi, le modèle du processus est construit au 
+    premier appel puis seul son objectif change.
+    """
+    rewards_c, A, b, solveur = _PROBLEME_FRONT["probleme"]
+    solutions = []
+    for poids in liste_poids:
+        c = poids @ rewards_c
+        if solveur == "gurobi":
+            gp = _gurobipy()
+            if "modele" not in _PROBLEME_FRONT:
+                _PROBLEME_FRONT["modele"] = _modele_gurobi("mixte", c, A, b)
+            pl, xs = _PROBLEME_FRONT["modele"]
+            pl.setAttr("Obj", xs.tolist(), c.tolist())
+            pl.optimize()
+            solutions.append(xs.X if pl.status == gp.GRB.OPTIMAL else None)
+        else:
+            solutions.append(_resoudre_pl("mixte", c, A, b, solveur = solveur)[0])
+    return solutions
+
+def _ordre_voisins(poids):
+    """
+    Retourne un ordre des vecteurs de poids où chacun est suivi du plus 
+    proche des poids restants, en partant du premier.
+    """
+    restants = list(range(1, len(poids)))
+    ordre = [0] if len(poids) > 0 else []
+    while restants:
+        distances = np.abs(poids[restants] - poids[ordre[-1]]).sum(1)
+        ordre.append(restants.pop(int(distances.argmin())))
+    return np.array(ordre, dtype = int)
+
+def _non_domines(valeurs, tol = 1e-9):
+    """
+    Retourne le masque des lignes de valeurs qui ne sont dominées par aucune
+    autre (en maximisant chaque critère). Parmi des lignes égales, seule la 
+    première est gardée.
+    """
+    sup_egal = (valeurs[None, :, :] >= valeurs[:, None, :] - tol).all(2)
+    sup = (valeurs[None, :, :] > valeurs[:, None, :] + tol).any(2)
+    domines = (sup_egal & sup).any(1)
+    egales = sup_egal & sup_egal.T
+    doublons = np.tril(egales, -1).any(1)
+    return ~(domines | doublons)
+
+
+class SolveurPL():
+    """
+    PL (ou PLNE) réutilisable pour résoudre plusieurs fois la même grille en
+    faisant varier gamma, M ou les coûts des couleurs. Le modèle Gurobi est
+    construit une seule fois : entre deux résolutions, on ne met à jour que
+    les coefficients qui ont changé (objectif pour M et les coûts, 
+    contraintes pour gamma) et chaque résolution repart de la base (PL) ou de
+    la solution (PLNE) précédente. Le modèle est reconstruit si tab ou p 
+    changent dans la grille.
+    Pour que gamma n'apparaisse que dans une contrainte par case, le flot 
+    entrant de chaque case s’ est représenté par une variable 
+    y(s’) = sum_(s, a) T(s, a, s’) x(s, a).
+    Cette classe utilise l'API de Gurobi et demande donc le module gurobipy.
+    
+    Parameters
+    ----------
+    grille : Grille
+        La Grille pour laquelle on calcule les stratégies optimales.
+    pure : bool
+        Si True, résout le PLNE de pol_pl_pure (stratégie pure), sinon le PL
+        de pol_pl_mixte (stratégie mixte). Le défaut est False.
+    mode : String
+        Avec quel coût calculer la stratégie. Deux modes: 'couleur' et 
+        'somme_chiffre'. Le défaut est 'couleur'.
+    verbose : bool
+        If True, shows the resolution of the PL calculated by Gurobi. Le défaut
+        est False.
+        
+    Attributes
+    ----------
+    grille : Grille
+        La Grille pour laquelle on calcule les stratégies optimales.
+    pure : bool
+        True pour le PLNE, False pour le PL.
+    mode : String
+        Le mode de calcul des coûts.
+    nb_constructions : int
+        Nombre de fois où le modèle a été construit.
+    nb_resolutions : int
+        Nombre de résolutions effectuées.
+    """
+    
+    def __init__(self, grille, pure = False, mode = "couleur", verbose = False):
+        assert mode in ["couleur", "somme_chiffre"], "Le mode doit être 'couleur' ou 'somme_chiffre'"
+        _choisir_solveur("gurobi")
+        self.grille = grille
+        self.pure = pure
+        self.mode = mode
+        self.verbose = verbose
+        self.nb_constructions = 0
+        self.nb_resolutions = 0
+        self._pl = None
+        self._depart = None
+        
+    def _construire(self, gamma):
+        """
+        Construit le modèle pour la grille courante et la valeur de gamma.
+        """
+        gp = _gurobipy()
+        pl = gp.Model("pure" if self.pure else "mixte")
+        if not self.verbose:
+            pl.setParam("OutputFlag", 0)
+        murs = self.grille.tab.ravel() < 0
+        nb = (~murs).sum()
+        trans = self.grille.matrice_trans()[np.repeat(~murs, 4)][:, ~murs]
+        identite = sp.identity(nb, format = "csr")
+        somme = sp.kron(identite, np.ones((1, 4)), format = "csr")
+        
+        xsa = pl.addMVar(4 * nb, name = "x")
+        ys = pl.addMVar(nb, lb = 0, name = "y")
+        x_y = xsa.tolist() + ys.tolist()
+        # Flot entrant : y(s’) - sum_(s, a) T(s, a, s’) x(s, a) = 0
+        pl.addMConstr(sp.hstack([- trans.T, identite], format = "csr"), x_y, "=", np.zeros(nb), name = "flux")
+        # Conservation du flot : sum_a x(s’, a) - gamma * y(s’) = 1 / nb
+        contr = pl.addMConstr(sp.hstack([somme, - gamma * identite], format = "csr"), x_y, "=", 
+                              np.full(nb, 1 / nb), name = "contr")
+        self._coeffs_y = list(zip(contr.tolist(), ys.tolist()))
+        self._coeffs_xd = []
+        
+        if self.pure:
+            dsa = pl.addMVar(4 * nb, name = "d", vtype = gp.GRB.BINARY)
+            pl.addMConstr(somme, dsa, "<", np.ones(nb), name = "contr_d")
+            identite_x = sp.identity(4 * nb, format = "csr")
+            contr_xd = pl.addMConstr(sp.hstack([(1 - gamma) * identite_x, - identite_x], format = "csr"), 
+                                     xsa.tolist() + dsa.tolist(), "<", np.zeros(4 * nb), name = "contr_xd")
+            self._coeffs_xd = list(zip(contr_xd.tolist(), xsa.tolist()))
+            self._dsa = dsa
+        
+        pl.update()
+        self._pl = pl
+        self._xsa = xsa
+        self._murs = murs
+        self._gamma = gamma
+        self._cle = (self.grille.tab.copy(), self.grille.p)
+        self._depart = None
+        self.nb_constructions += 1
+        
+    def _changer_gamma(self, gamma):
+        """
+        Met à jour les coefficients des contraintes qui dépendent de gamma.
+        """
+        for contr, var in self._coeffs_y:
+            self._pl.chgCoeff(contr, var, - gamma)
+        for contr, var in self._coeffs_xd:
+            self._pl.chgCoeff(contr, var, 1 - gamma)
+        self._gamma = gamma
+        
+    def resoudre(self, gamma, M, tab_cost = None, temps = False):
+        """
+        Calcule la stratégie optimale pour les paramètres passés en argument,
+        en réutilisant le modèle et la solution de la résolution précédente.
+
+        Parameters
+        ----------
+        gamma : float
+            Le gamma (taux d'amortissement) utilisé dans le calcul.
+        M : int
+            La récompense de la case but.
+        tab_cost : list(int)
+            Liste des coûts de chaque couleur, utilisée à la place de 
+            grille.tab_cost (qui n'est pas modifié). Si None, on utilise 
+            grille.tab_cost. Le défaut est None.
+        temps : bool
+            Si True, retourne aussi les temps de mise à jour et de résolution
+            du modèle. Le défaut est False.
+
+        Returns
+        -------
+        pol : numpy.ndarray
+            Tableau 2D (stratégie pure) ou 3D (stratégie mixte).
+        obj_val : float ou list(float)
+            Valeur de la fonction objectif à l'optimum, comme pour 
+            pol_pl_mixte et pol_pl_pure.
+        temps : dict
+            Seulement si temps est True. Temps (en secondes) de construction
+            ou de mise à jour ('construction') et de résolution 
+            ('resolution') du modèle, ainsi que les informations du solveur
+            (voir _resoudre_pl).
+        """
+        gp = _gurobipy()
+        debut = time.perf_counter()
+        if (self._pl is None or self._cle[1] != self.grille.p 
+            or not np.array_equal(self._cle[0], self.grille.tab)):
+            self._construire(gamma)
+        elif gamma != self._gamma:
+            self._changer_gamma(gamma)
+        
+        # Coefficients de la fonction objectif
+        tab_cost = self.grille.tab_cost if tab_cost is None else tab_cost
+        murs = self._murs
+        if self.mode == "couleur":
+            reward = - np.asarray(tab_cost, dtype = float)[self.grille.tab.ravel()[~murs]]
+        else:
+            reward = - self.grille.chiffre.ravel()[~murs].astype(float)
+        if not murs[-1]:
+            if self.mode == "couleur" or self.pure:
+                reward[-1] = M
+            else:
+                reward[-1] = M * len(tab_cost)
+        reward = np.repeat(reward, 4)
+        pl = self._pl
+        pl.setAttr("Obj", self._xsa.tolist(), reward.tolist())
+        pl.ModelSense = gp.GRB.MAXIMIZE
+        
+        # Départ à partir de la résolution précédente
+        if self._depart is not None:
+            if self.pure:
+                pl.setAttr("Start", pl.getVars(), self._depart)
+            else:
+                pl.setAttr("VBasis", pl.getVars(), self._depart[0])
+                pl.setAttr("CBasis", pl.getConstrs(), self._depart[1])
+        pl.update()
+        construction = time.perf_counter() - debut
+        
+        pl.optimize()
+        self.nb_resolutions += 1
+        strat = None
+        obj_val = None
+        if pl.status == gp.GRB.OPTIMAL:
+            solution = self._xsa.X
+            if self.pure:
+                self._depart = pl.getAttr("X", pl.getVars())
+                obj_val = pl.objVal
+                strat = np.zeros(self.grille.tab.size, dtype = int)
+                strat[~murs] = (self._dsa.X.reshape(-1, 4) > 0.5).argmax(1)
+                strat = strat.reshape(self.grille.tab.shape)
+            else:
+                self._depart = (pl.getAttr("VBasis", pl.getVars()), pl.getAttr("CBasis", pl.getConstrs()))
+                strat = _strat_mixte(self.grille, murs, solution)
+                if self.mode == "somme_chiffre":
+                    obj_val = (_recompenses_couleurs(self.grille, murs, M) @ solution).tolist()
+                else:
+                    obj_val = pl.objVal
+        else:
+            self._depart = None
+        infos = _infos_gurobi(pl, gp, self.pure)
+        infos.update(construction = construction, resolution = time.perf_counter() - debut - construction)
+        _enregistrer("SolveurPL.resoudre", infos)
+        if temps:
+            return strat, obj_val, infos
+        return strat, obj_val
+
+
+class CachePolitiques():
+    """
+    Cache des résultats des solveurs (pol_valeur, pol_pl_mixte, ...), indexé
+    par une empreinte (SHA-256) du contenu de la grille (tab, chiffre, 
+    tab_cost, p), du solveur et de ses arguments. Les résultats sont gardés 
+    en mémoire avec une politique LRU (le moins récemment utilisé est retiré
+    quand la taille maximale est atteinte) et, si un dossier est donné, aussi
+    sur disque, où ils restent après avoir été retirés de la mémoire.
+    Le cache garde une copie en lecture seule des tableaux des résultats, 
+    retournée sans copie à chaque succès en mémoire ; l'appel qui calcule 
+    (ou lit sur disque) un résultat retourne ses propres tableaux, qui 
+    restent modifiables.
+    Les appels dont le résultat n'est pas déterminé par les arguments ne 
+    sont pas mis en cache et lancent toujours le solveur : argument seed 
+    qui n'est pas un entier (None, générateur aléatoire, ...), générateur 
+    aléatoire ou fonction (rappel, ...) parmi les arguments.
+    
+    Parameters
+    ----------
+    taille_max : int
+        Nombre maximal de résultats gardés en mémoire. Le défaut est 128.
+    dossier : String
+        Dossier du cache sur disque. Si None, pas de cache sur disque. Le 
+        défaut est None.
+        
+    Attributes
+    ----------
+    taille_max : int
+        Nombre maximal de résultats gardés en mémoire.
+    dossier : String
+        Dossier du cache sur disque (ou None).
+    nb_succes : int
+        Nombre d'appels dont le résultat était en mémoire.
+    nb_succes_disque : int
+        Nombre d'appels dont le résultat a été trouvé sur disque.
+    nb_echecs : int
+        Nombre d'appels qui ont dû lancer le solveur.
+    nb_non_caches : int
+        Nombre d'appels qui ne pouvaient pas être mis en cache.
+    nb_evictions : int
+        Nombre de résultats retirés de la mémoire.
+    """
+    
+    def __init__(self, taille_max = 128, dossier = None):
+        self.taille_max = taille_max
+        self.dossier = dossier
+        if dossier is not None:
+            os.makedirs(dossier, exist_ok = True)
+        self._resultats = OrderedDict()
+        self.nb_succes = 0
+        self.nb_succes_disque = 0
+        self.nb_echecs = 0
+        self.nb_non_caches = 0
+        self.nb_evictions = 0
+        
+    def __len__(self):
+        return len(self._resultats)
+    
+    def cle(self, fonction, grille, *args, **kwargs):
+        """
+        Calcule l'empreinte d'un appel fonction(grille, *args, **kwargs). Les 
+        arguments sont d'abord complétés par leurs valeurs par défaut, de 
+        sorte que deux appels équivalents ont la même empreinte, et les 
+        nombres sont comparés par leur valeur (10, 10.0 et numpy.float64(10)
+        ont la même empreinte).
+
+        Returns
+        -------
+        String
+            L'empreinte en hexadécimal, ou None si l'appel ne peut pas être 
+            mis en cache (voir CachePolitiques).
+        """
+        arguments = inspect.signature(fonction).bind(grille, *args, **kwargs)
+        arguments.apply_defaults()
+        seed = arguments.arguments.get("seed", 0)
+        if (not isinstance(seed, numbers.Integral) or isinstance(seed, (bool, np.bool_)) 
+            or not _cachable(dict(arguments.arguments))):
+            return None
+        h = hashlib.sha256()
+        h.update((fonction.__module__ + "." + fonction.__qualname__).encode())
+        _empreinte(dict(arguments.arguments), h)
+        return h.hexdigest()
+    
+    def calculer(self, fonction, grille, *args, **kwargs):
+        """
+        Retourne fonction(grille, *args, **kwargs), depuis le cache si ce 
+        calcul a déjà été fait.
+        """
+        cle = self.cle(fonction, grille, *args, **kwargs)
+        if cle is None:
+            self.nb_non_caches += 1
+            return fonction(grille, *args, **kwargs)
+        if cle in self._resultats:
+            self.nb_succes += 1
+            self._resultats.move_to_end(cle)
+            return self._resultats[cle]
+        
+        fichier = None if self.dossier is None else os.path.join(self.dossier, cle + ".pkl")
+        if fichier is not None and os.path.exists(fichier):
+            self.nb_succes_disque += 1
+            with open(fichier, "rb") as f:
+                resultat = pickle.load(f)
+        else:
+            self.nb_echecs += 1
+            resultat = fonction(grille, *args, **kwargs)
+            if fichier is not None:
+                with open(fichier, "wb") as f:
+                    pickle.dump(resultat, f, pickle.HIGHEST_PROTOCOL)
+        
+        self._resultats[cle] = _copie_lecture_seule(resultat)
+        while len(self._resultats) > self.taille_max:
+            self._resultats.popitem(last = False)
+            self.nb_evictions += 1
+        return resultat
+    
+    def vider(self, disque = False):
+        """
+        Vide le cache en mémoire et, si disque est True, sur disque.
+        """
+        self._resultats.clear()
+        if disque and self.dossier is not None:
+            for nom in os.listdir(self.dossier):
+                if nom.endswith(".pkl"):
+                    os.remove(os.path.join(self.dossier, nom))
+
+def _empreinte(valeur, h):
+    """
+    Ajoute le contenu de valeur à l'objet de hachage h. Les tableaux numpy 
+    sont hachés par leur type, leur forme et leurs données, les grilles par
+    tab, chiffre, tab_cost et p, et les nombres (Python ou numpy) par leur 
+    valeur en float.
+    """
+    if isinstance(valeur, Grille):
+        h.update(b"Grille")
+        for attribut in (valeur.tab, valeur.chiffre, list(valeur.tab_cost), valeur.p):
+            _empreinte(attribut, h)
+    elif isinstance(valeur, np.ndarray):
+        h.update(str((valeur.dtype.str, valeur.shape)).encode())
+        h.update(np.ascontiguousarray(valeur).tobytes())
+    elif isinstance(valeur, (list, tuple)):
+        h.update((type(valeur).__name__ + str(len(valeur))).encode())
+        for v in valeur:
+            _empreinte(v, h)
+    elif isinstance(valeur, dict):
+        h.update(("dict" + str(len(valeur))).encode())
+        for k in sorted(valeur):
+            h.update(repr(k).encode())
+            _empreinte(valeur[k], h)
+    elif isinstance(valeur, (bool, np.bool_)):
+        h.update(repr(bool(valeur)).encode())
+    elif isinstance(valeur, numbers.Real):
+        h.update(("reel" + repr(float(valeur))).encode())
+    else:
+        h.update(repr(valeur).encode())
+
+def _cachable(valeur):
+    """
+    Indique si un argument (éventuellement dans des tuples, listes ou 
+    dictionnaires) peut être haché par _empreinte : les générateurs 
+    aléatoires et les fonctions ne peuvent pas l'être, leur repr ne 
+    dépendant pas de leur état.
+    """
+    if isinstance(valeur, (list, tuple)):
+        return all(_cachable(v) for v in valeur)
+    if isinstance(valeur, dict):
+        return all(_cachable(v) for v in valeur.values())
+    return not (callable(valeur) or isinstance(valeur, (np.random.Generator, np.random.RandomState, 
+                                                        np.random.BitGenerator, random.Random)))
+
+def _copie_lecture_seule(resultat):
+    """
+    Retourne une copie d'un résultat où les tableaux numpy (éventuellement 
+    dans des tuples, listes ou dictionnaires) sont copiés et mis en lecture 
+    seule.
+    """
+    if isinstance(resultat, np.ndarray):
+        copie = resultat.copy()
+        copie.flags.writeable = False
+        return copie
+    if isinstance(resultat, (list, tuple)):
+        return type(resultat)(_copie_lecture_seule(r) for r in resultat)
+    if isinstance(resultat, dict):
+        return {k: _copie_lecture_seule(r) for k, r in resultat.items()}
+    return resultat
+
 
 def tester_temps(fonction, list_grille, repeat = 10, **kwargs):
     """
@@ -1021,6 +3761,247 @@ def tester_iterations(fonction, list_grille, **kwargs):
         _, nb_iter = fonction(grille, **kwargs)
         cpt_iter += nb_iter
     return cpt_iter / (len(list_grille))
+
+def banc_essai(fonctions, tailles = [(10, 10)], proba_murs = [0], ps = [1], gammas = [0.9], nb_grilles = 5, 
+               repeat = 5, echauffement = 1, seed = 0, memoire = True, chemin = None, nb_processus = 1, 
+               vider_cache = True):
+    """
+    Banc d'essai des fonctions de calcul (pol_valeur, pol_pl_*, simulation,
+    ...), plus détaillé que tester_temps et tester_iterations. Pour chaque 
+    combinaison de taille de grille, de proba_mur, de p et de gamma, on tire
+    nb_grilles grilles avec Grille.lot (toujours les mêmes pour une même 
+    graine, pour que les résultats soient comparables d'une version à 
+    l'autre du code), puis chaque fonction est appelée echauffement fois sans
+    mesure et repeat fois avec time.perf_counter sur chaque grille. Par 
+    défaut, les caches de la grille (matrice de transitions, coûts, voir 
+    Grille.matrice_trans) sont vidés avant chaque appel, pour que les temps
+    comprennent leur construction comme lors d'un premier appel. La 
+    mémoire maximale allouée est mesurée à part avec tracemalloc, dans un 
+    appel supplémentaire, pour ne pas fausser les temps.
+    Les combinaisons (paramètres, fonction) peuvent être réparties sur 
+    plusieurs processus. Chaque processus est alors attaché à un seul cœur
+    (sous Linux) et limité à un seul thread de calcul, pour que les temps 
+    restent comparables à ceux d'une exécution en série : Gurobi avec 
+    Threads = 1, et bibliothèques d'algèbre linéaire par OMP_NUM_THREADS, 
+    OPENBLAS_NUM_THREADS et MKL_NUM_THREADS. Ces variables ne sont lues 
+    qu'au chargement de ces bibliothèques (à l'import de numpy) : les 
+    processus sont donc des interpréteurs neufs (méthode 'spawn') lancés 
+    avec ces variables déjà fixées.
+
+    Parameters
+    ----------
+    fonctions : dict
+        Dictionnaire indexé par le nom de chaque fonction testée et contenant
+        soit la fonction, soit un couple (fonction, kwargs), soit un triplet
+        (fonction, kwargs, preparation). Elle est appelée par 
+        fonction(grille, gamma = gamma, **kwargs, **preparation(grille, gamma)),
+        où preparation, appelée une fois par grille en dehors des mesures, 
+        retourne les arguments qui dépendent de la grille. Par exemple, pour 
+        simuler la stratégie de pol_valeur : 
+        (simulation, {"bonus": 100}, preparer) avec 
+        preparer(grille, gamma) = {"strategy": pol_valeur(grille, gamma, 10)[0]}.
+    tailles : list((int, int))
+        Tailles (nb_lig, nb_col) des grilles. Le défaut est [(10, 10)].
+    proba_murs : list(float)
+        Valeurs de proba_mur des grilles. Le défaut est [0].
+    ps : list(float)
+        Valeurs de p des grilles. Le défaut est [1].
+    gammas : list(float)
+        Valeurs de gamma. Le défaut est [0.9].
+    nb_grilles : int
+        Nombre de grilles de chaque combinaison. Le défaut est 5.
+    repeat : int
+        Nombre d'appels mesurés sur chaque grille. Le défaut est 5.
+    echauffement : int
+        Nombre d'appels non mesurés sur chaque grille avant les mesures. Le
+        défaut est 1.
+    seed : int
+        Graine du tirage des grilles. Le défaut est 0.
+    memoire : bool
+        Si True, mesure aussi la mémoire maximale. Le défaut est True.
+    chemin : String
+        Si donné, les résultats sont aussi écrits dans ce fichier, au format
+        JSON (avec la description de la machine et des versions) si son nom
+        finit par '.json', au format CSV sinon. Le défaut est None.
+    nb_processus : int
+        Nombre de processus utilisés. Si None, le nombre de processeurs de la
+        machine. Les fonctions testées (et de préparation) doivent alors 
+        pouvoir être importées par les nouveaux processus (pas de lambda, et
+        un script appelant doit être protégé par 
+        if __name__ == "__main__"). Avec 1, tout est mesuré dans le 
+        processus courant. Le défaut est 1.
+    vider_cache : bool
+        Si True, vide les caches de la grille avant chaque appel. Si False, 
+        les temps ne comprennent pas la construction de la matrice de 
+        transitions, faite pendant l'échauffement. Le défaut est True.
+
+    Returns
+    -------
+    list(dict)
+        Un dictionnaire par combinaison et par fonction, avec les paramètres,
+        les temps en secondes ('mediane', 'p10', 'p90', 'moyenne', 
+        'ecart_type', 'min', 'max'), la mémoire maximale en octets 
+        ('memoire_max'), le nombre moyen d'itérations des solveurs de 
+        programmation dynamique ('iterations' : itérations de pol_valeur ou
+        pol_valeur_lot, évaluations de pol_iteration, améliorations de 
+        pol_iteration_modifiee, ... ; pris dans le dictionnaire retourné en 
+        dernier s'il y en a un, sinon dans le deuxième élément retourné s'il
+        est entier, comme cpt de pol_valeur avec ou sans stats = True), le 
+        nombre moyen d'itérations du simplexe des PL ('iterations_simplexe',
+        pris dans le dictionnaire des pol_pl_* avec temps = True ou de 
+        SolveurPL.resoudre, reconnu par sa clé 'solveur'), et la médiane de
+        chaque temps détaillé ('temps_construction', 'temps_resolution', ... si la 
+        fonction retourne un dictionnaire de temps en dernier, comme les
+        pol_pl_* avec temps = True). Les nombres d'itérations valent None 
+        pour les fonctions qui n'en donnent pas (simulation, ...) et ne sont
+        comparables qu'entre fonctions de la même famille.
+    """
+    cellules = [(nom, fonction, (nb_lig, nb_col), proba_mur, p, gamma) 
+                for (nb_lig, nb_col) in tailles for proba_mur in proba_murs for p in ps for gamma in gammas
+                for nom, fonction in fonctions.items()]
+    nb_processus = min(nb_processus or os.cpu_count(), len(cellules))
+    if nb_processus <= 1:
+        resultats = [_mesurer_cellule(cellule, nb_grilles, repeat, echauffement, seed, memoire, vider_cache) 
+                     for cellule in cellules]
+    else:
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+        contexte = multiprocessing.get_context("spawn")
+        # Un cœur différent pour chaque processus, tant qu'il y en a assez
+        disponibles = sorted(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else [None]
+        coeurs = contexte.Queue()
+        for k in range(nb_processus):
+            coeurs.put(disponibles[k % len(disponibles)])
+        # Les processus héritent de l'environnement au moment où ils sont 
+        # lancés, avant d'importer numpy
+        variables = ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS")
+        anciennes = {variable: os.environ.get(variable) for variable in variables}
+        os.environ.update(dict.fromkeys(variables, "1"))
+        try:
+            with ProcessPoolExecutor(nb_processus, mp_context = contexte, initializer = _init_banc, 
+                                     initargs = (coeurs,)) as executeur:
+                resultats = list(executeur.map(_mesurer_cellule, cellules, 
+                                               *([x] * len(cellules) for x in (nb_grilles, repeat, echauffement, 
+                                                                               seed, memoire, vider_cache))))
+        finally:
+            for variable, valeur in anciennes.items():
+                if valeur is None:
+                    os.environ.pop(variable, None)
+                else:
+                    os.environ[variable] = valeur
+    if chemin is not None:
+        _ecrire_resultats(chemin, resultats)
+    return resultats
+
+def _init_banc(coeurs):
+    """
+    Prépare un processus de banc_essai : attache le processus à un cœur pris
+    dans la file coeurs et limite Gurobi à un seul thread (les bibliothèques
+    d'algèbre linéaire le sont par les variables d'environnement fixées par
+    banc_essai).
+    """
+    coeur = coeurs.get()
+    if coeur is not None:
+        os.sched_setaffinity(0, {coeur})
+    gp = _gurobipy()
+    if gp is not None:
+        gp.setParam("Threads", 1)
+
+def _mesurer_cellule(cellule, nb_grilles, repeat, echauffement, seed, memoire, vider_cache = True):
+    """
+    Mesure une fonction pour une combinaison de paramètres de banc_essai et
+    retourne le dictionnaire des résultats.
+    """
+    import tracemalloc
+    nom, fonction, (nb_lig, nb_col), proba_mur, p, gamma = cellule
+    kwargs, preparation = {}, None
+    if isinstance(fonction, tuple):
+        fonction, kwargs, preparation = fonction if len(fonction) == 3 else fonction + (None,)
+    grilles = Grille.lot(nb_grilles, nb_lig, nb_col, p = p, proba_mur = proba_mur, seed = seed)
+    temps, iterations, iterations_simplexe, details = [], [], [], defaultdict(list)
+    memoire_max = None
+    for grille in grilles:
+        arguments = dict(kwargs, **(preparation(grille, gamma) if preparation is not None else {}))
+        
+        def appeler():
+            if vider_cache:
+                grille._reinit_cache()
+            return fonction(grille, gamma = gamma, **arguments)
+        
+        for _ in range(echauffement):
+            appeler()
+        for _ in range(repeat):
+            if vider_cache:
+                grille._reinit_cache()
+            debut = time.perf_counter()
+            resultat = fonction(grille, gamma = gamma, **arguments)
+            temps.append(time.perf_counter() - debut)
+            if isinstance(resultat, tuple):
+                infos = resultat[-1] if isinstance(resultat[-1], dict) else {}
+                if isinstance(infos.get("iterations"), (int, np.integer)):
+                    # Les statistiques des PL (avec 'solveur') comptent les
+                    # itérations du simplexe
+                    (iterations_simplexe if "solveur" in infos else iterations).append(int(infos["iterations"]))
+                elif len(resultat) >= 2 and isinstance(resultat[1], (int, np.integer)):
+                    iterations.append(int(resultat[1]))
+                for cle in ("preparation", "construction", "resolution", "politique"):
+                    if cle in infos:
+                        details[cle].append(infos[cle])
+        if memoire:
+            tracemalloc.start()
+            appeler()
+            memoire_max = max(memoire_max or 0, tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+    
+    temps = np.array(temps)
+    resultat = {"fonction": nom, "nb_lig": nb_lig, "nb_col": nb_col, "proba_mur": proba_mur, "p": p, 
+                "gamma": gamma, "nb_mesures": int(temps.size), "mediane": float(np.median(temps)), 
+                "p10": float(np.percentile(temps, 10)), "p90": float(np.percentile(temps, 90)),
+                "moyenne": float(temps.mean()), "ecart_type": float(temps.std()), 
+                "min": float(temps.min()), "max": float(temps.max()), "memoire_max": memoire_max, 
+                "iterations": float(np.mean(iterations)) if iterations else None, 
+                "iterations_simplexe": float(np.mean(iterations_simplexe)) if iterations_simplexe else None}
+    for cle, t in details.items():
+        resultat["temps_" + cle] = float(np.median(t))
+    return resultat
+
+def _version_git():
+    """
+    Retourne le commit git du dossier de ce module ('commit') et si des 
+    fichiers suivis y sont modifiés ('modifie'), ou des None si git n'est 
+    pas disponible.
+    """
+    import subprocess
+    dossier = os.path.dirname(os.path.abspath(__file__))
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], cwd = dossier, capture_output = True, 
+                                text = True, check = True).stdout.strip()
+        modifie = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd = dossier, 
+                                 capture_output = True, text = True, check = True).stdout.strip() != ""
+    except (OSError, subprocess.CalledProcessError):
+        return {"commit": None, "modifie": None}
+    return {"commit": commit, "modifie": modifie}
+
+def _ecrire_resultats(chemin, resultats):
+    """
+    Écrit les résultats de banc_essai dans un fichier JSON ou CSV.
+    """
+    if chemin.endswith(".json"):
+        import platform
+        import scipy
+        meta = {"date": time.strftime("%Y-%m-%dT%H:%M:%S"), "machine": platform.machine(), 
+                "processeur": platform.processor(), "nb_processeurs": os.cpu_count(),
+                "python": platform.python_version(), "numpy": np.__version__, "scipy": scipy.__version__}
+        meta.update(_version_git())
+        with open(chemin, "w") as f:
+            json.dump({"meta": meta, "resultats": resultats}, f, indent = 1)
+    else:
+        import csv
+        colonnes = list(dict.fromkeys(cle for r in resultats for cle in r))
+        with open(chemin, "w", newline = "") as f:
+            ecrivain = csv.DictWriter(f, colonnes)
+            ecrivain.writeheader()
+            ecrivain.writerows(resultats)
    
         
 if __name__ == "__main__":